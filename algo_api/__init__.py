@@ -1,4 +1,19 @@
 from .api import *
 from .errors import *
 from .classes import *
-from .datatypes import *
\ No newline at end of file
+from .datatypes import *
+from .transport import *
+from .cache import *
+from .pool import *
+from .aio import *
+from .sync import *
+from .decode import *
+from .table import *
+from .snapshot import *
+from .threads import *
+from .graph import *
+from .leaderboard import *
+from .search import *
+from .metrics import *
+from .download import *
+from .query import *
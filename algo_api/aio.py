@@ -0,0 +1,202 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from .api import *
+from .errors import *
+from .classes import *
+
+class AsyncSession:
+    def __init__(self, max_concurrency:int=10, **options):
+        '''
+        An asyncio version of `Session`.
+
+        Every method is a coroutine that returns the same
+        objects as its `Session` counterpart. Up to
+        `max_concurrency` requests are in flight at once,
+        all of them sharing one connection pool.
+
+        `options` are passed to the underlying `Session`.
+        '''
+        if type(max_concurrency) != int:
+            raise TypeError(f'\'max_concurrency\' should be int')
+        if max_concurrency < 1:
+            raise ValueError('\'max_concurrency\' should be at least 1')
+
+        self.max_concurrency = max_concurrency
+        self.sync = Session(**options)
+        self.sync.transport.ensure_pool(max_concurrency)
+        self.executor = None
+
+    @property
+    def id(self) -> int:
+        return self.sync.id
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        if self.sync.session != None:
+            await self.close()
+
+    async def _run(self, func, *args, **kwargs):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='algo_api'
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _iter_pages(self, fetch, per_page:int, limit:int=None):
+        if type(per_page) != int:
+            raise TypeError(f'\'per_page\' should be int')
+        if limit is not None and type(limit) != int:
+            raise TypeError(f'\'limit\' should be int')
+
+        page = 1
+        count = 0
+        task = asyncio.ensure_future(self._run(fetch, page))
+        try:
+            while task is not None:
+                items = await task
+                task = None
+
+                # prefetching the next page unless this one is the last
+                if len(items) >= per_page and (limit is None or count+len(items) < limit):
+                    page += 1
+                    task = asyncio.ensure_future(self._run(fetch, page))
+
+                for item in items:
+                    if limit is not None and count >= limit:
+                        return
+                    yield item
+                    count += 1
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _iter_sync(self, items):
+        # pulling items from a blocking generator on the executor
+        end = object()
+        while True:
+            item = await self._run(next, items, end)
+            if item is end:
+                return
+            yield item
+
+    async def login(self, login:str, password:str):
+        '''
+        Used to login into the system.
+        '''
+        await self._run(self.sync.login, login, password)
+
+    async def close(self):
+        '''
+        Closes the session.
+
+        You'll need to `login()` in order to continue
+        using the system.
+        '''
+        self.sync.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+    # actions
+    async def my_profile(self, expand:list=None) -> SelfProfile:
+        return await self._run(self.sync.my_profile, expand)
+
+    async def get_profile(self, id:int, raw:bool=False, expand:list=None) -> Profile:
+        return await self._run(self.sync.get_profile, id, raw, expand)
+
+    async def get_profiles_many(self, ids, workers:int=8, ordered:bool=True) -> list:
+        return await self._run(
+            lambda: list(self.sync.get_profiles_many(ids, workers, ordered))
+        )
+
+    async def my_projects(self, sort=SORT_LATEST, raw:bool=False, expand:list=None,
+                          types:list=None) -> list:
+        return await self._run(self.sync.my_projects, sort, raw, expand, types)
+
+    async def get_projects(self, id:int=None, page:int=1, per_page:int=50, sort=SORT_LATEST,
+                           raw:bool=False, expand:list=None, types:list=None) -> list:
+        return await self._run(self.sync.get_projects, id, page, per_page, sort, raw, expand, types)
+
+    async def get_trending(self, interval:str, raw:bool=False, expand:list=None) -> list:
+        return await self._run(self.sync.get_trending, interval, raw, expand)
+
+    async def get_hall_of_fame(self, raw:bool=False) -> dict:
+        return await self._run(self.sync.get_hall_of_fame, raw)
+
+    async def get_project(self, id:int, expand:list=None) -> Project:
+        return await self._run(self.sync.get_project, id, expand)
+
+    async def get_projects_many(self, ids, workers:int=8, ordered:bool=True) -> list:
+        return await self._run(
+            lambda: list(self.sync.get_projects_many(ids, workers, ordered))
+        )
+
+    async def place_reaction(self, id:int, reaction:str):
+        return await self._run(self.sync.place_reaction, id, reaction)
+
+    async def remove_reaction(self, id:int, reaction:str):
+        return await self._run(self.sync.remove_reaction, id, reaction)
+
+    async def post_comment(self, id:int, text:str, reply_to:int=None) -> Comment:
+        return await self._run(self.sync.post_comment, id, text, reply_to)
+
+    async def delete_comment(self, id:int):
+        return await self._run(self.sync.delete_comment, id)
+
+    async def get_comments(self, id:int, page:int=1, per_page:int=50, raw:bool=False) -> list:
+        return await self._run(self.sync.get_comments, id, page, per_page, raw)
+
+    async def get_all_comments(self, id:int, per_page:int=50, workers:int=8) -> CommentThread:
+        return await self._run(self.sync.get_all_comments, id, per_page, workers)
+
+    def iter_projects(self, id:int=None, sort=SORT_LATEST, per_page:int=50, limit:int=None,
+                      raw:bool=False, expand:list=None, types:list=None):
+        if id is not None and type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        return self._iter_pages(
+            lambda page: self.sync.get_projects(id, page, per_page, sort, raw, expand, types),
+            per_page, limit
+        )
+
+    def stream_projects(self, id:int=None, page:int=1, per_page:int=50, sort=SORT_LATEST,
+                        raw:bool=False, expand:list=None, types:list=None):
+        return self._iter_sync(self.sync.stream_projects(id, page, per_page, sort, raw, expand, types))
+
+    def stream_comments(self, id:int, page:int=1, per_page:int=50):
+        return self._iter_sync(self.sync.stream_comments(id, page, per_page))
+
+    def iter_comments(self, id:int, per_page:int=50, limit:int=None):
+        if type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        return self._iter_pages(
+            lambda page: self.sync.get_comments(id, page, per_page),
+            per_page, limit
+        )
+
+    async def get_source_code(self, id:int) -> str:
+        return await self._run(self.sync.get_source_code, id)
+
+    async def change_source_code(self, id:int, code:str, name:str=None):
+        return await self._run(self.sync.change_source_code, id, code, name)
+
+    async def get_source_codes(self, ids, workers:int=8, ordered:bool=True) -> list:
+        return await self._run(
+            lambda: list(self.sync.get_source_codes(ids, workers, ordered))
+        )
+
+    async def change_source_codes(self, codes:dict, workers:int=8, ordered:bool=True,
+                                  names:dict=None) -> list:
+        return await self._run(
+            lambda: list(self.sync.change_source_codes(codes, workers, ordered, names))
+        )
+
+    async def edit_project(self, id:int, title:str=None, description:str=None):
+        return await self._run(self.sync.edit_project, id, title, description)
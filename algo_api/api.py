@@ -1,12 +1,144 @@
+import random
+import time
+import itertools
+from collections import deque
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from .errors import *
 from .classes import *
+from .transport import *
+from .cache import ProjectIdMap, ValidatorCache, Validated
+from .decode import loads, iter_items
+from .query import *
+from .threads import CommentThread
+
+# bytes read at once from streamed responses
+STREAM_CHUNK_SIZE = 65536
+
+# seconds each read endpoint stays in the cache
+CACHE_TTL = {
+    'profile':  60,
+    'project':  60,
+    'projects': 30,
+    'trending': 300,
+    'comments': 30,
+}
+
+# the platform all requests are sent to
+BASE_URL = 'https://learn.algoritmika.org'
+
+# statuses worth retrying a request on
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def _iter_pages(fetch, per_page:int, limit:int=None):
+    '''
+    Yields items from `fetch(page)` page by page, fetching
+    the next page in the background while the current
+    one is being consumed.
+    '''
+    if type(per_page) != int:
+        raise TypeError(f'\'per_page\' should be int')
+    if limit is not None and type(limit) != int:
+        raise TypeError(f'\'limit\' should be int')
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='algo_api')
+    try:
+        page = 1
+        count = 0
+        future = executor.submit(fetch, page)
+
+        while future is not None:
+            items = future.result()
+            future = None
+
+            # prefetching the next page unless this one is the last
+            if len(items) >= per_page and (limit is None or count+len(items) < limit):
+                page += 1
+                future = executor.submit(fetch, page)
+
+            for item in items:
+                if limit is not None and count >= limit:
+                    return
+                yield item
+                count += 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _map_many(func, ids, workers:int, ordered:bool):
+    '''
+    Calls `func(id)` for every ID on a pool of `workers`
+    threads and yields `(id, result)` tuples.
+
+    If the call fails with an API or connection error,
+    the exception is yielded as the result for that ID.
+    '''
+    if type(workers) != int:
+        raise TypeError(f'\'workers\' should be int')
+    if workers < 1:
+        raise ValueError('\'workers\' should be at least 1')
+
+    def call(id):
+        try:
+            return func(id)
+        except (DefaultException, requests.RequestException) as e:
+            return e
+
+    # only a few calls per worker are submitted ahead, and futures are
+    # dropped once yielded, so memory doesn't grow with the number of IDs
+    ids = iter(ids)
+    window = workers*2
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='algo_api')
+    try:
+        if ordered:
+            futures = deque()
+            for id in itertools.islice(ids, window):
+                futures.append((id, executor.submit(call, id)))
+            while futures:
+                id, future = futures.popleft()
+                result = future.result()
+                for next_id in itertools.islice(ids, 1):
+                    futures.append((next_id, executor.submit(call, next_id)))
+                yield id, result
+        else:
+            pending = {executor.submit(call, id): id for id in itertools.islice(ids, window)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    id = pending.pop(future)
+                    for next_id in itertools.islice(ids, 1):
+                        pending[executor.submit(call, next_id)] = next_id
+                    yield id, future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 class Session:
-    def __init__(self, login, password):
+    def __init__(self, login:str=None, password:str=None, cache=None, cache_ttl:dict=None,
+                 lazy:bool=False, keep_dict:bool=True, retries:int=3, backoff:float=0.5,
+                 max_backoff:float=30, rate_limit:RateLimiter=None, transport:Transport=None,
+                 project_ids:ProjectIdMap=None, hooks:list=None, base_url:str=BASE_URL,
+                 validators:ValidatorCache=None, identity_map:IdentityMap=None):
+        if lazy and not keep_dict:
+            raise ValueError('Lazy objects have to keep their dict')
+
         self.session = None
         self.id = None
-        self.login(login, password)
+        self.base_url = base_url.rstrip('/')
+        self.transport = transport if transport is not None else Transport()
+        self._owns_transport = transport is None
+        self.cache = cache
+        self.cache_ttl = {**CACHE_TTL, **(cache_ttl or {})}
+        self.lazy = lazy
+        self.keep_dict = keep_dict
+        self.identity_map = identity_map
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limit = rate_limit
+        self.project_ids = project_ids if project_ids is not None else ProjectIdMap()
+        self.hooks = list(hooks) if hooks is not None else []
+        self.validators = validators
+        if login is not None:
+            self.login(login, password)
 
     def login(self, login, password):
         '''
@@ -17,24 +149,125 @@ class Session:
 
         self.login_name = login
         self.password = password
+        self.session, self.id = self._login()
+
+    def _relogin(self):
+        '''
+        Logs in again on a new connection session and swaps
+        it in. The old one isn't closed, so that requests
+        other threads are sending with it can finish.
+        '''
+        self.session, self.id = self._login()
 
-        # logging in
-        self.session = requests.Session()
-        res = self.post('https://learn.algoritmika.org/s/auth/api/e/student/auth', data={
+    def _login(self) -> tuple:
+        '''
+        Logs in on a new connection session and returns
+        it together with the user ID.
+        '''
+        session = requests.Session()
+        self.transport.mount(session)
+        res = self._send('POST', f'{self.base_url}/s/auth/api/e/student/auth', data={
             'login': self.login_name,
             'password': self.password
-        })
+        }, session=session)
         
         # successfully logged in
         if res.status_code == 200:
-            item = res.json()['item']
-            self.id = item['studentId']
+            item = self._loads(res)['item']
+            return session, item['studentId']
 
         # error handling
-        elif res.status_code == 400:
+        session.adapters.clear()
+        session.close()
+        if self._owns_transport and self.session == None:
+            self.transport.close()
+        if res.status_code == 400:
             raise InvalidCredentials('Login or password are incorrect')
-        else:
-            raise UnknownException(res.json())
+        self._raise(res)
+
+    def _send(self, method:str, *args, session:requests.Session=None, **kwargs) -> requests.Response:
+        '''
+        Submits a request, waiting for the rate limiter and
+        retrying it with exponential backoff on rate limits,
+        server errors and connection errors.
+
+        Only GET requests are retried on server and connection
+        errors, as other requests might have already been
+        processed by the server.
+
+        `session` is the connection session to send the
+        request with, the current one by default.
+        '''
+        # read once, as another thread might swap or close it
+        if session is None:
+            session = self.session
+        if session == None:
+            raise SessionClosed('Session is closed, use login() to login')
+
+        url = args[0] if args else kwargs.get('url')
+        attempt = 0
+        while True:
+            if self.rate_limit is not None:
+                self.rate_limit.acquire()
+
+            for hook in self.hooks:
+                hook.before_request(method, url)
+            start = time.perf_counter()
+            try:
+                res = session.request(method, *args, **{'timeout': self.transport.timeout, **kwargs})
+            except (requests.ConnectionError, requests.Timeout) as e:
+                for hook in self.hooks:
+                    hook.on_error(method, url, e, time.perf_counter()-start)
+                if attempt >= self.retries or (method != 'GET' and not isinstance(e, requests.ConnectTimeout)):
+                    raise
+                delay = None
+            else:
+                for hook in self.hooks:
+                    hook.after_response(method, url, res, time.perf_counter()-start)
+                if res.status_code not in RETRY_STATUSES or attempt >= self.retries\
+                or (method != 'GET' and res.status_code != 429):
+                    return res
+                delay = retry_after(res.headers.get('Retry-After'))
+                if delay is not None and self.rate_limit is not None:
+                    self.rate_limit.pause(delay)
+
+            # exponential backoff with jitter
+            if delay is None:
+                delay = min(self.max_backoff, self.backoff * 2**attempt) * random.uniform(0.5, 1)
+            time.sleep(delay)
+            attempt += 1
+
+    def _raise(self, res:requests.Response):
+        '''
+        Raises an exception matching the failed response.
+        '''
+        try:
+            message = res.json()
+        except ValueError:
+            message = f'{res.status_code} {res.reason}: {res.text[:500]}'
+
+        if res.status_code == 401:
+            raise Unauthorized(message)
+        if res.status_code == 404:
+            raise NotFound(message)
+        if res.status_code == 429:
+            raise RateLimited(message)
+        if res.status_code >= 500:
+            raise ServerError(message)
+        raise UnknownException(message)
+
+    def request(self, method:str, *args, **kwargs) -> requests.Response:
+        '''
+        Submits a request with the passed method to your
+        endpoint using the system's session.
+
+        It is not recommended to send requests to
+        third-party endpoints.
+        '''
+        res = self._send(method, *args, **kwargs)
+        if res.status_code != 200:
+            self._raise(res)
+        return res
 
     def post(self, *args, **kwargs) -> requests.Response:
         '''
@@ -44,13 +277,7 @@ class Session:
         It is not recommended to send requests to
         third-party endpoints.
         '''
-        if self.session != None:
-            res = self.session.post(*args, **kwargs)
-            if res.status_code != 200:
-                raise UnknownException(res.json())
-            return res 
-        else:
-            raise SessionClosed('Session is closed, use login() to login')
+        return self.request('POST', *args, **kwargs)
 
     def get(self, *args, **kwargs) -> requests.Response:
         '''
@@ -60,13 +287,7 @@ class Session:
         It is not recommended to send requests to
         third-party endpoints.
         '''
-        if self.session != None:
-            res = self.session.get(*args, **kwargs)
-            if res.status_code != 200:
-                raise UnknownException(res.json())
-            return res 
-        else:
-            raise SessionClosed('Session is closed, use login() to login')
+        return self.request('GET', *args, **kwargs)
 
     def delete(self, *args, **kwargs) -> requests.Response:
         '''
@@ -76,13 +297,7 @@ class Session:
         It is not recommended to send requests to
         third-party endpoints.
         '''
-        if self.session != None:
-            res = self.session.delete(*args, **kwargs)
-            if res.status_code != 200:
-                raise UnknownException(res.json())
-            return res 
-        else:
-            raise SessionClosed('Session is closed, use login() to login')
+        return self.request('DELETE', *args, **kwargs)
 
     def close(self):
         '''
@@ -91,104 +306,358 @@ class Session:
         You'll need to `login()` in order to continue
         using the system.
         '''
+        self._close_session()
+        self.id = None
+
+    def _close_session(self):
+        # the transport may be shared with other sessions
+        self.session.adapters.clear()
         self.session.close()
         self.session = None
-        self.id = None
+        if self._owns_transport:
+            self.transport.close()
+
+    def _loads(self, res:requests.Response):
+        '''
+        Parses the JSON body of the response, reporting the
+        time it took to the hooks.
+        '''
+        if len(self.hooks) == 0:
+            return loads(res.content)
+
+        start = time.perf_counter()
+        data = loads(res.content)
+        elapsed = time.perf_counter()-start
+        for hook in self.hooks:
+            hook.on_parse(res.url, len(res.content), elapsed)
+        return data
+
+    def _build(self, cls, items:list) -> list:
+        '''
+        Builds objects of the passed class from the response
+        items, reporting the time it took to the hooks.
+        '''
+        # the logged in user has no previews to share
+        options = (self.lazy, self.keep_dict) if cls == SelfProfile\
+                  else (self.lazy, self.keep_dict, self.identity_map)
+        if len(self.hooks) == 0:
+            return [cls(i, *options) for i in items]
+
+        start = time.perf_counter()
+        result = [cls(i, *options) for i in items]
+        elapsed = time.perf_counter()-start
+        for hook in self.hooks:
+            hook.on_build(cls.__name__, len(result), elapsed)
+        return result
+
+    def _get_data(self, endpoint:str, key:str, url:str, build=None):
+        '''
+        Submits a GET request and returns the `data` part
+        of the response, going through the cache if the
+        session has one.
+
+        If `build` is passed, returns `build(data)` instead.
+        '''
+        if self.session == None:
+            raise SessionClosed('Session is closed, use login() to login')
+
+        ttl = self.cache_ttl.get(endpoint, 0)
+        if self.cache is None or ttl <= 0:
+            return self._fetch_data(url, build)
+
+        # responses depend on who is asking (reactions, friend status)
+        key = f'{endpoint}:{key}:{self.id}'
+        data = self.cache.get(key)
+        if data is None:
+            data = self._fetch_data(url)
+            self.cache.set(key, data, ttl)
+        return data if build is None else build(data)
+
+    def _fetch_data(self, url:str, build=None):
+        '''
+        Submits a GET request and returns the `data` part of
+        the response or `build(data)`.
+
+        If the session has validators, the request is made
+        conditional, and if the server answers that nothing
+        changed, the data and the objects built from it the
+        last time are returned.
+        '''
+        if self.validators is None:
+            data = self._loads(self.get(url))['data']
+            return data if build is None else build(data)
+
+        # like the TTL cache, responses depend on who is asking
+        key = (url, self.id)
+        item = self.validators.get(key)
+        headers = {}
+        if item is not None:
+            if item.etag is not None:
+                headers['If-None-Match'] = item.etag
+            if item.last_modified is not None:
+                headers['If-Modified-Since'] = item.last_modified
+
+        res = self._send('GET', url, headers=headers)
+        if res.status_code == 304 and item is not None:
+            self.validators.not_modified(item)
+            if build is None:
+                return item.data
+            if item.result is None:
+                item.result = build(item.data)
+            return item.result
+        if res.status_code != 200:
+            self._raise(res)
+
+        data = self._loads(res)['data']
+        result = None if build is None else build(data)
+        self.validators.set(key, Validated(
+            res.headers.get('ETag'), res.headers.get('Last-Modified'),
+            len(res.content), data, result
+        ))
+        return data if build is None else result
+
+    def _projects(self, items:list, raw:bool=False) -> list:
+        '''
+        Builds projects from the response, remembering the
+        editor IDs of python projects along the way.
+
+        If `raw` is `True`, the response items are returned
+        as they are.
+        '''
+        self.project_ids.update({
+            i['id']: i['meta']['projectId'] for i in items
+            if i['type'] == TYPE_PYTHON and type(i['meta']) == dict and 'projectId' in i['meta']
+        })
+        if raw:
+            return items
+        return self._build(Project, items)
+
+    def _project_data(self, id:int, expand:list=None) -> dict:
+        expand = expand_param(expand, PROJECT_EXPAND)
+        return self._get_data(
+            'project', f'{id}:{expand}',
+            build_url(self.base_url, f'/api/v1/projects/info/{id}', expand=expand)
+        )
+
+    def _python_data(self, id:int) -> dict:
+        '''
+        Requests a python project bypassing the cache, so
+        that its title is current.
+        '''
+        res = self.get(build_url(self.base_url, f'/api/v1/projects/info/{id}'))
+        data = self._loads(res)['data']
+        if data['type'] != TYPE_PYTHON:
+            raise TypeError('Project should be a `python` project.')
+        self._projects([data], True)
+        return data
+
+    def _python_project(self, id:int) -> int:
+        '''
+        Returns the editor ID of a python project, only
+        requesting the project if it wasn't seen before.
+        '''
+        project_id = self.project_ids.get(id)
+        if project_id is not None:
+            return project_id
+        return self._python_data(id)['meta']['projectId']
+
+    def _projects_url(self, id:int, page:int, per_page:int, sort:str,
+                      expand:list=None, types:list=None) -> str:
+        if id is not None and type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        return build_url(
+            self.base_url, '/api/v1/projects',
+            expand=expand_param(expand, PROJECT_EXPAND), sort=f'-{sort}', scope='universe',
+            type=types_param(types), page=page, perPage=per_page, studentId=id
+        )
+
+    def _stream_items(self, url:str):
+        '''
+        Submits a GET request and yields elements of the
+        `items` array as soon as they are received.
+        '''
+        res = self._send('GET', url, stream=True)
+        try:
+            if res.status_code != 200:
+                self._raise(res)
+            yield from iter_items(res.iter_content(STREAM_CHUNK_SIZE))
+        finally:
+            res.close()
+
+    def _invalidate(self, *prefixes:str):
+        if self.cache is None:
+            return
+        for prefix in prefixes:
+            self.cache.invalidate(prefix)
 
 
     # actions
-    def my_profile(self):
+    def my_profile(self, expand:list=None):
         '''
         Fetches and returns the profile of currently 
         logged in user.
-        '''
-        data = self.get(
-            'https://learn.algoritmika.org/api/v1/profile?\
-            expand=branch,settings,locations,permissions,avatar,referral,course',
-        )
-        return SelfProfile(data.json()['data'])
+
+        `expand` chooses which of the `SELF_PROFILE_EXPAND`
+        parts are requested, all of them by default.
+        '''
+        data = self.get(build_url(
+            self.base_url, '/api/v1/profile',
+            expand=expand_param(expand, SELF_PROFILE_EXPAND)
+        ))
+        return self._build(SelfProfile, [self._loads(data)['data']])[0]
     
     
-    def get_profile(self, id:int):
+    def get_profile(self, id:int, raw:bool=False, expand:list=None):
         '''
         Fetches and returns the profile of the user
         with the passed ID.
+
+        If `raw` is `True`, returns the profile dict
+        from the response instead of a `Profile` object.
+
+        `expand` chooses which of the `PROFILE_EXPAND`
+        parts are requested, all of them by default.
         '''
         if type(id) != int:
             raise TypeError(f'\'id\' should be int')
         
-        data = self.get(
-            f'https://learn.algoritmika.org/api/v2/community/profile/index?\
-            expand=stats,avatars&studentId={id}'
+        expand = expand_param(expand, PROFILE_EXPAND)
+        return self._get_data(
+            'profile', f'{id}:{expand}',
+            build_url(self.base_url, '/api/v2/community/profile/index', expand=expand, studentId=id),
+            None if raw else lambda data: self._build(Profile, [data])[0]
         )
-        return Profile(data.json()['data'])
         
         
-    def my_projects(self, sort=SORT_LATEST):
+    def my_projects(self, sort=SORT_LATEST, raw:bool=False, expand:list=None, types:list=None):
         '''
         Fetches and returns all projects of currently
         logged in user.
-        '''
-        data = self.get(
-            f'https://learn.algoritmika.org/api/v1/projects?\
-            expand=uploads,remix&sort=-{sort}&scope=student&\
-            type=design,gamedesign,images,presentation,python,scratch,unity,video,vscode,website',
-        )
-        return [Project(i) for i in data.json()['data']['items']]
+
+        If `raw` is `True`, returns the project dicts
+        from the response instead of `Project` objects.
+
+        `expand` chooses which of the `PROJECT_EXPAND` parts
+        are requested and `types` which project types, all
+        of them by default.
+        '''
+        data = self.get(build_url(
+            self.base_url, '/api/v1/projects',
+            expand=expand_param(expand, PROJECT_EXPAND), sort=f'-{sort}', scope='student',
+            type=types_param(types)
+        ))
+        return self._projects(self._loads(data)['data']['items'], raw)
         
         
-    def get_projects(self, id:int=None, page:int=1, per_page:int=50, sort=SORT_LATEST):
+    def get_projects(self, id:int=None, page:int=1, per_page:int=50, sort=SORT_LATEST, raw:bool=False,
+                     expand:list=None, types:list=None):
         '''
         Fetches and returns all projects of the user
         with the passed ID or if the ID is not provided
         will fetch the projects from the universe.
+
+        If `raw` is `True`, returns the project dicts
+        from the response instead of `Project` objects.
+
+        `expand` chooses which of the `PROJECT_EXPAND` parts
+        are requested and `types` which project types, all
+        of them by default.
+        '''
+        result = self._get_data(
+            'projects', f'{"universe" if id is None else id}:{page}:{per_page}:{sort}:'
+                f'{expand_param(expand, PROJECT_EXPAND)}:{types_param(types)}',
+            self._projects_url(id, page, per_page, sort, expand, types),
+            None if raw else lambda data: self._projects(data['items'])
+        )
+        return self._projects(result['items'], True) if raw else result
+
+
+    def stream_projects(self, id:int=None, page:int=1, per_page:int=50, sort=SORT_LATEST,
+                        raw:bool=False, expand:list=None, types:list=None):
         '''
-        if id is None:
-            data = self.get(
-                f'https://learn.algoritmika.org/api/v1/projects?\
-                expand=uploads,remix&sort=-{sort}&scope=universe&\
-                type=design,gamedesign,images,presentation,python,scratch,unity,video,vscode,website&\
-                page={page}&perPage={per_page}',
-            )
-        elif type(id) == int:
-            data = self.get(
-                f'https://learn.algoritmika.org/api/v1/projects?\
-                expand=uploads,remix&sort=-{sort}&scope=universe&\
-                type=design,gamedesign,images,presentation,python,scratch,unity,video,vscode,website&\
-                page={page}&perPage={per_page}&studentId={id}',
-            )
-        else:
-            raise TypeError(f'\'id\' should be int')
+        Same as `get_projects()`, but yields projects one
+        by one while the response is still being received,
+        without keeping the whole page in memory.
+
+        Streamed pages are never cached.
+        '''
+        url = self._projects_url(id, page, per_page, sort, expand, types)
+        return (self._projects([i], raw)[0] for i in self._stream_items(url))
+        
+        
+    def get_profiles_many(self, ids, workers:int=8, ordered:bool=True):
+        '''
+        Fetches profiles of all users with the passed IDs
+        concurrently and yields `(id, Profile)` tuples.
 
-        return [Project(i) for i in data.json()['data']['items']]
+        If a profile could not be fetched, the exception
+        is yielded in place of the profile.
+        '''
+        self.transport.ensure_pool(workers)
+        return _map_many(self.get_profile, ids, workers, ordered)
         
         
-    def get_trending(self, interval:str):
+    def get_trending(self, interval:str, raw:bool=False, expand:list=None):
         '''
         Fetches and returns all trending projects
         with the interval provided.
-        '''
-        data = self.get(
-            f'https://learn.algoritmika.org/api/v1/projects/trends?\
-            interval={interval}&expand=remix'
-        )
 
-        return [Project(i) for i in data.json()['data']['items']]
+        If `raw` is `True`, returns the project dicts
+        from the response instead of `Project` objects.
+
+        `expand` chooses which of the `TRENDING_EXPAND`
+        parts are requested, all of them by default.
+        '''
+        expand = expand_param(expand, TRENDING_EXPAND)
+        result = self._get_data(
+            'trending', f'{interval}:{expand}',
+            build_url(self.base_url, '/api/v1/projects/trends', interval=interval, expand=expand),
+            None if raw else lambda data: self._projects(data['items'])
+        )
+        return self._projects(result['items'], True) if raw else result
+        
         
+    def get_hall_of_fame(self, raw:bool=False) -> dict:
+        '''
+        Fetches trending projects for all intervals at
+        once and returns them as `{interval: projects}`.
+        '''
+        intervals = (TRENDS_DAY, TRENDS_WEEK, TRENDS_MONTH)
+        self.transport.ensure_pool(len(intervals))
+        result = {}
+        for interval, projects in _map_many(
+            lambda i: self.get_trending(i, raw), intervals, len(intervals), True
+        ):
+            if isinstance(projects, Exception):
+                raise projects
+            result[interval] = projects
+        return result
         
-    def get_project(self, id:int):
+        
+    def get_project(self, id:int, expand:list=None):
         '''
         Fetches and returns a project with the ID
         provided.
+
+        `expand` chooses which of the `PROJECT_EXPAND`
+        parts are requested, all of them by default.
         '''
         if type(id) != int:
             raise TypeError(f'\'id\' should be int')
         
-        data = self.get(
-            f'https://learn.algoritmika.org/api/v1/projects/info/{id}?\
-            expand=uploads,remix',
-        )
-        return Project(data.json()['data'])
+        return self._projects([self._project_data(id, expand)])[0]
+        
+        
+    def get_projects_many(self, ids, workers:int=8, ordered:bool=True):
+        '''
+        Fetches projects with the passed IDs concurrently
+        and yields `(id, Project)` tuples.
+
+        If a project could not be fetched, the exception
+        is yielded in place of the project.
+        '''
+        self.transport.ensure_pool(workers)
+        return _map_many(self.get_project, ids, workers, ordered)
         
         
     def place_reaction(self, id:int, reaction:str):
@@ -200,13 +669,14 @@ class Session:
             raise TypeError(f'\'id\' should be int')
         
         self.post(
-            'https://learn.algoritmika.org/api/v2/community/reaction/add',
+            f'{self.base_url}/api/v2/community/reaction/add',
             data={
                 'ownerId': id,
                 'ownerType': 'project_relation',
                 'type': reaction
             }
         )
+        self._invalidate(f'project:{id}:', 'projects:', 'trending:')
         
         
     def remove_reaction(self, id:int, reaction:str):
@@ -218,13 +688,14 @@ class Session:
             raise TypeError(f'\'id\' should be int')
         
         self.post(
-            'https://learn.algoritmika.org/api/v2/community/reaction/remove',
+            f'{self.base_url}/api/v2/community/reaction/remove',
             data={
                 'ownerId': id,
                 'ownerType': 'project_relation',
                 'type': reaction
             }
         )
+        self._invalidate(f'project:{id}:', 'projects:', 'trending:')
         
         
     def post_comment(self, id:int, text:str, reply_to:int = None):
@@ -243,10 +714,11 @@ class Session:
             data = {'message': text, 'parentCommentId': reply_to}
         
         data = self.post(
-            f'https://learn.algoritmika.org/api/v1/projects/comment/{id}',
+            f'{self.base_url}/api/v1/projects/comment/{id}',
             data=data
         )
-        return Comment(data.json()['data'])
+        self._invalidate(f'comments:{id}:', f'project:{id}:')
+        return self._build(Comment, [self._loads(data)['data']])[0]
         
         
     def delete_comment(self, id:int):
@@ -257,14 +729,19 @@ class Session:
             raise TypeError(f'\'id\' should be int')
         
         self.delete(
-            f'https://learn.algoritmika.org/api/v1/projects/comment/{id}'
+            f'{self.base_url}/api/v1/projects/comment/{id}'
         )
+        # the project of the comment is unknown here
+        self._invalidate('comments:', 'project:')
         
         
-    def get_comments(self, id:int, page:int = 1, per_page:int = 50):
+    def get_comments(self, id:int, page:int = 1, per_page:int = 50, raw:bool=False):
         '''
         Fetches and returns all comments under the project
         with the passed ID.
+
+        If `raw` is `True`, returns the comment dicts
+        from the response instead of `Comment` objects.
         '''
         if type(id) != int:
             raise TypeError(f'\'id\' should be int')
@@ -273,11 +750,96 @@ class Session:
         if type(per_page) != int:
             raise TypeError(f'\'per_page\' should be int')
         
-        data = self.get(
-            f'https://learn.algoritmika.org/api/v1/projects/comment/{id}?\
-            page={page}&perPage={per_page}&sort=-id',
+        result = self._get_data(
+            'comments', f'{id}:{page}:{per_page}',
+            build_url(self.base_url, f'/api/v1/projects/comment/{id}', page=page, perPage=per_page, sort='-id'),
+            None if raw else lambda data: self._build(Comment, data['items'])
+        )
+        return result['items'] if raw else result
+
+
+    def get_all_comments(self, id:int, per_page:int=50, workers:int=8) -> CommentThread:
+        '''
+        Fetches all pages of comments under the project
+        with the passed ID, `workers` pages at a time,
+        and returns them as a `CommentThread`.
+        '''
+        if type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        if type(per_page) != int:
+            raise TypeError(f'\'per_page\' should be int')
+
+        result = self.get_comments(id, 1, per_page, raw=True)
+        items = list(result)
+        page = 1
+        self.transport.ensure_pool(workers)
+
+        # the number of pages is unknown, so they are fetched in
+        # batches until one of them is not full
+        while len(result) == per_page:
+            pages = range(page+1, page+1+workers)
+            for _, result in _map_many(
+                lambda i: self.get_comments(id, i, per_page, raw=True), pages, workers, True
+            ):
+                if isinstance(result, Exception):
+                    raise result
+                items += result
+                page += 1
+                if len(result) < per_page:
+                    break
+
+        # comments posted while fetching shift the pages
+        seen = set()
+        items = [i for i in items if i['id'] not in seen and not seen.add(i['id'])]
+        return CommentThread(items, self.keep_dict, self.identity_map)
+
+
+    def stream_comments(self, id:int, page:int = 1, per_page:int = 50):
+        '''
+        Same as `get_comments()`, but yields comments one
+        by one while the response is still being received.
+
+        Streamed pages are never cached.
+        '''
+        if type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        if type(page) != int:
+            raise TypeError(f'\'page\' should be int')
+        if type(per_page) != int:
+            raise TypeError(f'\'per_page\' should be int')
+
+        url = build_url(self.base_url, f'/api/v1/projects/comment/{id}', page=page, perPage=per_page, sort='-id')
+        return (self._build(Comment, [i])[0] for i in self._stream_items(url))
+
+
+    def iter_projects(self, id:int=None, sort=SORT_LATEST, per_page:int=50, limit:int=None,
+                      raw:bool=False, expand:list=None, types:list=None):
+        '''
+        Yields projects of the user with the passed ID
+        (or from the universe if the ID is not provided)
+        one by one, going through all of the pages.
+        '''
+        if id is not None and type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+
+        return _iter_pages(
+            lambda page: self.get_projects(id, page, per_page, sort, raw, expand, types),
+            per_page, limit
+        )
+
+
+    def iter_comments(self, id:int, per_page:int=50, limit:int=None):
+        '''
+        Yields comments under the project with the passed
+        ID one by one, going through all of the pages.
+        '''
+        if type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+
+        return _iter_pages(
+            lambda page: self.get_comments(id, page, per_page),
+            per_page, limit
         )
-        return [Comment(i) for i in data.json()['data']['items']]
     
 
     def get_source_code(self, id:int) -> str:
@@ -287,39 +849,87 @@ class Session:
         if type(id) != int:
             raise TypeError(f'\'id\' should be int')
         
-        res = self.get(f'https://learn.algoritmika.org/api/v1/projects/info/{id}?expand=uploads')
-        res = res.json()['data']
-        if res['type'] != 'python':
-            raise TypeError('Project should be a `python` project.')
-        
-        res = self.get(f"https://learn.algoritmika.org/api/v1/python/open?id={res['meta']['projectId']}")
-        return res.json()['data']['content']
+        project_id = self._python_project(id)
+        res = self.get(build_url(self.base_url, '/api/v1/python/open', id=project_id))
+        return self._loads(res)['data']['content']
+
+
+    def get_source_codes(self, ids, workers:int=8, ordered:bool=True):
+        '''
+        Fetches the code of all of your python projects
+        with the passed IDs concurrently and yields
+        `(id, code)` tuples.
+
+        If the code could not be fetched, the exception
+        is yielded in place of the code.
+        '''
+        def fetch(id):
+            try:
+                return self.get_source_code(id)
+            except TypeError as e:
+                return e
+
+        self.transport.ensure_pool(workers)
+        return _map_many(fetch, ids, workers, ordered)
     
 
-    def change_source_code(self, id:int, code:str):
+    def change_source_code(self, id:int, code:str, name:str=None):
         '''
         Rewrites the code of your python project to
         the new one.
+
+        The editor saves the title of the project along
+        with the code. If `name` isn't passed, the current
+        title is requested from the server, otherwise the
+        project is renamed to `name`.
         '''
         if type(id) != int:
             raise TypeError(f'\'id\' should be int')
         
-        res = self.get(f'https://learn.algoritmika.org/api/v1/projects/info/{id}?expand=uploads')
-        res = res.json()['data']
-        if res['type'] != 'python':
-            raise TypeError('Project should be a `python` project.')
-        
+        project_id = self.project_ids.get(id)
+        if project_id is None or name is None:
+            data = self._python_data(id)
+            project_id = data['meta']['projectId']
+            if name is None:
+                name = data['title']
         self.post(
-            f"https://learn.algoritmika.org/api/v1/python/save?id={res['meta']['projectId']}",
-            data={"content": str(code), "name": res['title']}
+            build_url(self.base_url, '/api/v1/python/save', id=project_id),
+            data={"content": str(code), "name": str(name)}
         )
+        self._invalidate(f'project:{id}:', 'projects:')
+
+
+    def change_source_codes(self, codes:dict, workers:int=8, ordered:bool=True, names:dict=None):
+        '''
+        Rewrites the code of your python projects
+        concurrently. `codes` maps project IDs to their
+        new code. Yields `(id, None)` tuples.
+
+        `names` maps project IDs to the titles to save
+        with the code, like `name` in `change_source_code()`.
+        Projects that are in it are saved in one request
+        once their editor ID is known, the rest take two.
+
+        If the code could not be changed, the exception
+        is yielded in place of `None`.
+        '''
+        names = names if names is not None else {}
+
+        def change(id):
+            try:
+                return self.change_source_code(id, codes[id], names.get(id))
+            except TypeError as e:
+                return e
+
+        self.transport.ensure_pool(workers)
+        return _map_many(change, list(codes), workers, ordered)
 
 
     def edit_project(self, id:int, title:str=None, description:str=None):
         '''
         Edits your project title and/or description
         '''
-        if id is not int: raise TypeError('\'id\' should be int')
+        if type(id) != int: raise TypeError('\'id\' should be int')
         data = {}
         if title != None:
             data['title'] = str(title)
@@ -327,4 +937,5 @@ class Session:
             data['description'] = str(description)
 
         if len(data) == 0: raise ValueError('Either title and/or description must be provided')
-        self.post(f'https://learn.algoritmika.org/api/v1/projects/update/{id}', data=data)
+        self.post(f'{self.base_url}/api/v1/projects/update/{id}', data=data)
+        self._invalidate(f'project:{id}:', 'projects:', 'trending:')
@@ -0,0 +1,318 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# how many hits SQLiteCache remembers before writing their times
+_USED_BATCH = 1024
+
+class MemoryCache:
+    def __init__(self, max_size:int=1024):
+        '''
+        In-memory LRU cache for API responses.
+        '''
+        if type(max_size) != int:
+            raise TypeError(f'\'max_size\' should be int')
+
+        self.max_size: int = max_size
+        self.hits: int =     0
+        self.misses: int =   0
+        self._items =        OrderedDict()
+        self._lock =         threading.Lock()
+
+    def get(self, key:str):
+        '''
+        Returns the cached value or `None` if there is
+        no such value or it has expired.
+        '''
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[1] < time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key:str, value, ttl:float):
+        '''
+        Caches the value for `ttl` seconds.
+        '''
+        with self._lock:
+            self._items[key] = (value, time.monotonic()+ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, prefix:str):
+        '''
+        Removes all values whose keys start with `prefix`.
+        '''
+        with self._lock:
+            for key in [i for i in self._items if i.startswith(prefix)]:
+                del self._items[key]
+
+    def clear(self):
+        '''
+        Removes all values and resets the counters.
+        '''
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class SQLiteCache:
+    def __init__(self, path:str, max_size:int=65536):
+        '''
+        On-disk LRU cache for API responses stored in
+        an SQLite database, so it survives restarts.
+
+        Hits don't write to the database, their times are
+        written in batches and before values are evicted.
+        '''
+        if type(max_size) != int:
+            raise TypeError(f'\'max_size\' should be int')
+
+        self.path: str =     path
+        self.max_size: int = max_size
+        self.hits: int =     0
+        self.misses: int =   0
+        self._lock =         threading.Lock()
+        self._used =         {}     # key: time of the last hit, not written yet
+        self._db =           sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT, expires REAL, used REAL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS cache_used ON cache (used)')
+        self._db.commit()
+
+    def get(self, key:str):
+        '''
+        Returns the cached value or `None` if there is
+        no such value or it has expired.
+        '''
+        with self._lock:
+            now = time.time()
+            row = self._db.execute(
+                'SELECT value, expires FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._db.execute('DELETE FROM cache WHERE key = ?', (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+
+            self._used[key] = now
+            if len(self._used) >= _USED_BATCH:
+                self._write_used()
+                self._db.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def _write_used(self):
+        if self._used:
+            self._db.executemany(
+                'UPDATE cache SET used = ? WHERE key = ?',
+                [(j, i) for i, j in self._used.items()]
+            )
+            self._used.clear()
+
+    def set(self, key:str, value, ttl:float):
+        '''
+        Caches the value for `ttl` seconds.
+        '''
+        with self._lock:
+            now = time.time()
+            # eviction needs the times of recent hits
+            self._write_used()
+            self._db.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), now+ttl, now)
+            )
+            self._db.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                (self.max_size,)
+            )
+            self._db.commit()
+
+    def invalidate(self, prefix:str):
+        '''
+        Removes all values whose keys start with `prefix`.
+        '''
+        with self._lock:
+            self._db.execute(
+                'DELETE FROM cache WHERE substr(key, 1, ?) = ?',
+                (len(prefix), prefix)
+            )
+            self._db.commit()
+
+    def clear(self):
+        '''
+        Removes all values and resets the counters.
+        '''
+        with self._lock:
+            self._used.clear()
+            self._db.execute('DELETE FROM cache')
+            self._db.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        '''
+        Writes the times of recent hits and closes
+        the database.
+        '''
+        with self._lock:
+            self._write_used()
+            self._db.commit()
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+class ProjectIdMap:
+    def __init__(self, path:str=None):
+        '''
+        Maps community IDs of python projects to their IDs
+        in the online code editor.
+
+        If `path` is passed, the map is kept in an SQLite
+        database there, so it survives restarts.
+        '''
+        self.path: str = path
+        self._items =    {}
+        self._lock =     threading.Lock()
+        self._db =       None
+
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS project_ids ('
+                'id INTEGER PRIMARY KEY, project_id INTEGER)'
+            )
+            self._db.commit()
+            for id, project_id in self._db.execute('SELECT id, project_id FROM project_ids'):
+                self._items[id] = project_id
+
+    def get(self, id:int) -> int | None:
+        '''
+        Returns the editor ID of the project or `None`
+        if the project wasn't seen yet.
+        '''
+        return self._items.get(id)
+
+    def update(self, items:dict):
+        '''
+        Remembers `{id: project_id}` pairs.
+        '''
+        with self._lock:
+            items = {i: j for i, j in items.items() if self._items.get(i) != j}
+            if len(items) == 0:
+                return
+            self._items.update(items)
+            if self._db is not None:
+                self._db.executemany(
+                    # databases written by older versions also have a title column
+                    'INSERT OR REPLACE INTO project_ids (id, project_id) VALUES (?, ?)',
+                    list(items.items())
+                )
+                self._db.commit()
+
+    def close(self):
+        '''
+        Closes the database.
+        '''
+        if self._db is not None:
+            self._db.close()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class Validated:
+    __slots__ = ('etag', 'last_modified', 'size', 'data', 'result')
+
+    def __init__(self, etag:str, last_modified:str, size:int, data, result=None):
+        '''
+        A response remembered by `ValidatorCache`.
+        '''
+        self.etag: str =          etag
+        self.last_modified: str = last_modified
+        self.size: int =          size      # length of the response body
+        self.data =               data      # parsed `data` part of the response
+        self.result =             result    # objects built from `data`
+
+class ValidatorCache:
+    def __init__(self, max_size:int=1024):
+        '''
+        Remembers `ETag` and `Last-Modified` validators of
+        GET responses along with their parsed data, so that
+        the session can send conditional requests and reuse
+        the data when the server answers `304 Not Modified`.
+        '''
+        if type(max_size) != int:
+            raise TypeError(f'\'max_size\' should be int')
+
+        self.max_size: int =    max_size
+        self.hits: int =        0   # 304 responses
+        self.misses: int =      0   # full responses
+        self.bytes_saved: int = 0   # response bodies that weren't sent again
+        self._items =           OrderedDict()
+        self._lock =            threading.Lock()
+
+    def get(self, key:tuple) -> Validated | None:
+        '''
+        Returns the remembered response for the
+        `(url, student ID)` key or `None` if there is none.
+        '''
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def set(self, key:tuple, item:Validated):
+        '''
+        Remembers a full response for the
+        `(url, student ID)` key.
+        '''
+        with self._lock:
+            self.misses += 1
+            if item.etag is None and item.last_modified is None:
+                self._items.pop(key, None)
+                return
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def not_modified(self, item:Validated):
+        '''
+        Counts a `304` response to a remembered one.
+        '''
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += item.size
+
+    def clear(self):
+        '''
+        Forgets all responses and resets the counters.
+        '''
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.bytes_saved = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
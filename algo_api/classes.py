@@ -1,17 +1,89 @@
 import datetime
+import functools
+import threading
+import weakref
 from .errors import *
 from .datatypes import *
 
+@functools.lru_cache(maxsize=8192)
+def _parse_datetime(value:str) -> datetime.datetime:
+    '''
+    Parses an ISO-8601 timestamp from the API, keeping
+    its timezone offset. Timestamps repeat a lot across
+    responses, so the results are cached.
+    '''
+    if value.endswith('Z'):
+        value = value[:-1]+'+00:00'
+    return datetime.datetime.fromisoformat(value)
+
 class NotImplemented:
     def __init__(self, message):
         self.message = message
     def __call__(self):
         raise NotImplementedException(self.message)
+
+def lazy_attribute(func):
+    '''
+    Marks the `_name` method of a `Model` as the builder
+    of its `name` attribute.
+    '''
+    func.lazy_attribute = func.__name__[1:]
+    return func
+
+class Model:
+    '''
+    An object built from an API response.
+
+    If the object is created with `lazy=True`, its nested
+    objects are built from `dict` on first access instead
+    of in `__init__`. If it's created with `keep_dict=False`,
+    the raw response is dropped once everything is built.
+    '''
+    __slots__ = ()
+    _lazy_attributes: dict = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._lazy_attributes = {
+            func.lazy_attribute: func
+            for base in reversed(cls.__mro__) for func in vars(base).values()
+            if hasattr(func, 'lazy_attribute')
+        }
+
+    def __getattr__(self, name):
+        # only called for slots that weren't set yet
+        func = self._lazy_attributes.get(name)
+        if func is None:
+            raise AttributeError(f'\'{type(self).__name__}\' object has no attribute \'{name}\'')
+        value = func(self)
+        setattr(self, name, value)
+        return value
+
+    def _load(self, lazy:bool, keep_dict:bool):
+        if lazy:
+            if not keep_dict:
+                raise ValueError('Lazy objects have to keep their dict')
+            return
+
+        for name, func in self._lazy_attributes.items():
+            setattr(self, name, func(self))
+        if not keep_dict:
+            self._drop_dict()
+
+    def _drop_dict(self):
+        self.dict = None
+        for name in self._lazy_attributes:
+            value = getattr(self, name)
+            for i in value if type(value) == list else (value,):
+                if isinstance(i, Model):
+                    i._drop_dict()
     
 
 # PROFILES
 
 class Branch:
+    __slots__ = ('id', 'brand_name', 'title', 'code', 'phone', 'site_url')
+
     def __init__(self, data):
         '''
         Branch that the user is learning in.
@@ -31,6 +103,8 @@ class Branch:
         return self.id
 
 class Ban:
+    __slots__ = ('is_banned', 'reason', 'expires_at')
+
     def __init__(self, data):
         '''
         User's ban status.
@@ -39,17 +113,12 @@ class Ban:
         self.reason: str =     data['reason']
 
         # date
-        if data['expiresAt'] != None:
-            date = [int(i) for i in data['expiresAt'][0:19].split('T')[0].split('-')]
-            time = [int(i) for i in data['expiresAt'][0:19].split('T')[1].split(':')]
-            self.expires_at: datetime.datetime = datetime.datetime(
-                year=date[0], month=date[1], day=date[2],
-                hour=time[0], minute=time[1], second=time[2]
-            )
-        else:
-            self.expiresAt = None
+        self.expires_at: datetime.datetime | None = _parse_datetime(data['expiresAt'])\
+                                                    if data['expiresAt'] != None else None
 
 class Settings:
+    __slots__ = ('allowed_file_extensions', 'vscode_file_name_pattern', 'prosveshenie_token')
+
     def __init__(self, data):
         '''
         User's editor settings.
@@ -59,6 +128,11 @@ class Settings:
         self.prosveshenie_token: str =       data['prosveshenieToken']
 
 class Course:
+    __slots__ = (
+        'id', 'name', 'display_name', 'description', 'gamification_enabled',
+        'gamification_level_points', 'gamification_bonus_points'
+    )
+
     def __init__(self, data):
         '''
         User's course.
@@ -78,6 +152,11 @@ class Course:
         return self.display_name
 
 class UserStats:
+    __slots__ = (
+        'classmates', 'projects', 'views', 'likes', 'reactions', 'friends',
+        'followers', 'following', 'avatars', 'avatar_items', 'lootboxes'
+    )
+
     def __init__(self, data):
         '''
         User's stats.
@@ -95,6 +174,8 @@ class UserStats:
         self.lootboxes: int =     data['totalLootboxes']
 
 class Avatar:
+    __slots__ = ('name', 'small_url', 'svg_url')
+
     def __init__(self, data):
         '''
         User's avatar data.
@@ -107,6 +188,8 @@ class Avatar:
         return self.svg_url
 
 class AvatarTemplate:
+    __slots__ = ('name', 'url', 'small_url')
+
     def __init__(self, data):
         '''
         Avatar preset.
@@ -119,6 +202,8 @@ class AvatarTemplate:
         return self.url
 
 class Avatars:
+    __slots__ = ('available', 'svg_url')
+
     def __init__(self, data):
         # self.selected =        NotImplemented('Unknown format')
         self.available: list = [AvatarTemplate(i) for i in data['available']]
@@ -127,8 +212,14 @@ class Avatars:
     def __str__(self) -> str:
         return self.svg_url
 
-class SelfProfile:
-    def __init__(self, data):
+class SelfProfile(Model):
+    __slots__ = (
+        'dict', 'id', 'first_name', 'last_name', 'parent_name', 'full_name',
+        'username', 'phone', 'email', 'is_teacher', 'is_celebrity', 'lang',
+        'url', 'branch', 'ban', 'settings', 'avatar', 'course', 'birth_date'
+    )
+
+    def __init__(self, data, lazy:bool=False, keep_dict:bool=True):
         '''
         The user that is currently logged in.
         '''
@@ -146,31 +237,56 @@ class SelfProfile:
         self.is_teacher: bool =   data['isTeacher']
         self.is_celebrity: bool = data['isCelebrity']
         self.lang: str =          data['lang']
-        self.branch: Branch =     Branch(data['branch'])
-        self.ban: Ban =           Ban(data['ban'])
-        self.settings: Settings = Settings(data['settings'])
-        self.avatar: Avatar =     Avatar(data['avatar'])
-        self.course: Course =     Course(data['course'])
         self.url: str =           f'https://learn.algoritmika.org/student-profile?profileId={self.id}'
 
-        # date
-        date = [int(i) for i in data['birthDate'][0:10].split('-')] if data['birthDate'] is not None else None
-        self.birth_date: datetime.date | None = datetime.date(
-            year=date[0], month=date[1], day=date[2]
-        ) if date is not None else None
-
         # not implemented
         # self.referral =        NotImplemented('Unknown format')
         # self.locations: list = NotImplemented('Unknown format')
 
+        self._load(lazy, keep_dict)
+
+    @lazy_attribute
+    def _branch(self) -> Branch | None:
+        return None if self.dict.get('branch') is None\
+               else Branch(self.dict['branch'])
+
+    @lazy_attribute
+    def _ban(self) -> Ban:
+        return Ban(self.dict['ban'])
+
+    @lazy_attribute
+    def _settings(self) -> Settings | None:
+        return None if self.dict.get('settings') is None\
+               else Settings(self.dict['settings'])
+
+    @lazy_attribute
+    def _avatar(self) -> Avatar | None:
+        return None if self.dict.get('avatar') is None\
+               else Avatar(self.dict['avatar'])
+
+    @lazy_attribute
+    def _course(self) -> Course | None:
+        return None if self.dict.get('course') is None\
+               else Course(self.dict['course'])
+
+    @lazy_attribute
+    def _birth_date(self) -> datetime.date | None:
+        return datetime.date.fromisoformat(self.dict['birthDate'][0:10])\
+               if self.dict['birthDate'] is not None else None
+
     def __str__(self) -> str:
         return self.full_name
     
     def __int__(self) -> int:
         return self.id
     
-class ProfilePreview:
-    def __init__(self, data):
+class ProfilePreview(Model):
+    __slots__ = (
+        'dict', 'id', 'first_name', 'last_name', 'full_name',
+        'is_celebrity', 'url', 'avatar', '__weakref__'
+    )
+
+    def __init__(self, data, lazy:bool=False, keep_dict:bool=True):
         '''
         A preview of a user.
         '''
@@ -182,22 +298,102 @@ class ProfilePreview:
         self.last_name: str =     data['lastName']
         self.full_name: str =     data['name']
         self.is_celebrity: bool = data['isCelebrity']
-        self.avatar: Avatar =     Avatar(data['avatar'])
         self.url: str =           f'https://learn.algoritmika.org/student-profile?profileId={self.id}'
 
+        self._load(lazy, keep_dict)
+
+    @lazy_attribute
+    def _avatar(self) -> Avatar:
+        return Avatar(self.dict['avatar'])
+
     def __str__(self) -> str:
         return self.full_name
     
     def __int__(self) -> int:
         return self.id
+
+    def _matches(self, data) -> bool:
+        avatar = data['avatar']
+        return self.full_name == data['name'] and self.first_name == data['firstName']\
+           and self.last_name == data['lastName'] and self.is_celebrity == data['isCelebrity']\
+           and self.avatar.svg_url == avatar['svgUrl'] and self.avatar.small_url == avatar['smallUrl']\
+           and self.avatar.name == avatar['name']
+
+class IdentityMap:
+    def __init__(self):
+        '''
+        Keeps one `ProfilePreview` per user, so that authors
+        of projects and comments and friends of profiles
+        are shared between all objects built with the map
+        (see the `identity_map` option of `Session`).
+
+        Previews are held weakly and disappear once nothing
+        else refers to them. If a user's data in a newer
+        response differs, a new preview replaces the shared
+        one, and objects built before keep the old one.
+        Shared previews don't keep their `dict`.
+        '''
+        self.hits: int =   0
+        self.misses: int = 0
+        self._items =      weakref.WeakValueDictionary()
+        self._lock =       threading.Lock()
+
+    def preview(self, data) -> ProfilePreview:
+        '''
+        Returns the shared preview of the user,
+        creating or replacing it from `data`.
+        '''
+        with self._lock:
+            preview = self._items.get(data['id'])
+            if preview is not None and preview._matches(data):
+                self.hits += 1
+                return preview
+
+            # previews are never changed once shared, as
+            # other threads might be reading them
+            self.misses += 1
+            preview = self._items[data['id']] = ProfilePreview(data, keep_dict=False)
+            return preview
+
+    def get(self, id:int) -> ProfilePreview | None:
+        '''
+        Returns the shared preview of the user with the
+        passed ID or `None` if there is none.
+        '''
+        return self._items.get(id)
+
+    def clear(self):
+        '''
+        Forgets all previews and resets the counters.
+        '''
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+def _preview(data, identity_map:IdentityMap | None) -> ProfilePreview:
+    if identity_map is None:
+        return ProfilePreview(data)
+    return identity_map.preview(data)
     
-class Profile:
-    def __init__(self, data):
+class Profile(Model):
+    __slots__ = (
+        'dict', 'id', 'first_name', 'last_name', 'full_name',
+        'is_celebrity', 'about', 'course_name', 'city', 'friend_status',
+        'url', 'stats', 'avatar', 'friends', 'classmates', 'updated_at',
+        '_identity_map'
+    )
+
+    def __init__(self, data, lazy:bool=False, keep_dict:bool=True, identity_map:IdentityMap=None):
         '''
         The fetched user.
         '''
         # data
         self.dict = data
+        self._identity_map = identity_map   # shares friends and classmates
 
         self.id: int =            data['id']
         self.first_name: str =    data['firstName']
@@ -208,22 +404,32 @@ class Profile:
         self.course_name: str =   data['activeCourse']
         self.city: str =          data['city'] if data['city'] != 'in_progress' else None
         self.friend_status: str = data['friendStatus'] # follow, friend or None
-        self.stats: UserStats =   UserStats(data['stats'])
-        self.avatar: Avatars =    Avatars(data['avatars'])
-        self.friends: list =      [ProfilePreview(i) for i in data['friends']]
-        self.classmates: list =   [ProfilePreview(i) for i in data['classmates']]
         self.url: str =           f'https://learn.algoritmika.org/student-profile?profileId={self.id}'
 
-        # date
-        if data['updatedAt'] != None:
-            date = [int(i) for i in data['updatedAt'][0:19].split('T')[0].split('-')]
-            time = [int(i) for i in data['updatedAt'][0:19].split('T')[1].split(':')]
-            self.updated_at: datetime.datetime = datetime.datetime(
-                year=date[0], month=date[1], day=date[2],
-                hour=time[0], minute=time[1], second=time[2]
-            )
-        else:
-            self.updated_at = None
+        self._load(lazy, keep_dict)
+
+    @lazy_attribute
+    def _stats(self) -> UserStats | None:
+        return None if self.dict.get('stats') is None\
+               else UserStats(self.dict['stats'])
+
+    @lazy_attribute
+    def _avatar(self) -> Avatars | None:
+        return None if self.dict.get('avatars') is None\
+               else Avatars(self.dict['avatars'])
+
+    @lazy_attribute
+    def _friends(self) -> list:
+        return [_preview(i, self._identity_map) for i in self.dict['friends']]
+
+    @lazy_attribute
+    def _classmates(self) -> list:
+        return [_preview(i, self._identity_map) for i in self.dict['classmates']]
+
+    @lazy_attribute
+    def _updated_at(self) -> datetime.datetime | None:
+        return _parse_datetime(self.dict['updatedAt'])\
+               if self.dict['updatedAt'] != None else None
 
     def __str__(self) -> str:
         return self.full_name
@@ -235,6 +441,8 @@ class Profile:
 # PROJECTS
 
 class PreviewImage:
+    __slots__ = ('name', 'small_url', 'url')
+
     def __init__(self, data):
         '''
         A preview image for a project.
@@ -247,6 +455,8 @@ class PreviewImage:
         return self.url
     
 class Reactions:
+    __slots__ = ('you_placed_like', 'you_placed_love', 'you_placed_fire', 'likes', 'loves', 'fires')
+
     def __init__(self, data):
         self.you_placed_like: bool = REACTION_LIKE in data['my']
         self.you_placed_love: bool = REACTION_LOVE in data['my']
@@ -259,24 +469,16 @@ class Reactions:
                                      if REACTION_FIRE in data['counters'] else 0
 
 class Upload:
+    __slots__ = ('id', 'filename', 'url', 'created_at', 'updated_at')
+
     def __init__(self, data):
         self.id: int       = data['id']
         self.filename: str = data['filename']
         self.url: str      = 'https://learn.algoritmika.org'+data['filepath']
 
         # date
-        date = [int(i) for i in data['createdAt'][0:19].split('T')[0].split('-')]
-        time = [int(i) for i in data['createdAt'][0:19].split('T')[1].split(':')]
-        self.created_at: datetime.datetime = datetime.datetime(
-            year=date[0], month=date[1], day=date[2],
-            hour=time[0], minute=time[1], second=time[2]
-        )
-        date = [int(i) for i in data['updatedAt'][0:19].split('T')[0].split('-')]
-        time = [int(i) for i in data['updatedAt'][0:19].split('T')[1].split(':')]
-        self.updated_at: datetime.datetime = datetime.datetime(
-            year=date[0], month=date[1], day=date[2],
-            hour=time[0], minute=time[1], second=time[2]
-        )
+        self.created_at: datetime.datetime = _parse_datetime(data['createdAt'])
+        self.updated_at: datetime.datetime = _parse_datetime(data['updatedAt'])
 
     def __str__(self) -> str:
         return self.url
@@ -285,6 +487,8 @@ class Upload:
         return self.id
     
 class RemixedProject:
+    __slots__ = ('id', 'title', 'author_name', 'url')
+
     def __init__(self, data):
         self.id: int =          data['id']
         self.title: str =       data['title']
@@ -297,13 +501,22 @@ class RemixedProject:
     def __int__(self) -> int:
         return self.id
 
-class Project:
-    def __init__(self, data):
+class Project(Model):
+    __slots__ = (
+        'dict', 'id', 'title', 'description', 'type', 'availability',
+        'likes', 'views', 'remixes', 'comments', 'is_deleted',
+        'remix_enabled', 'url', 'meta', 'author', 'image', 'reactions',
+        'original_project', 'uploads', 'created_at', 'updated_at',
+        '_identity_map'
+    )
+
+    def __init__(self, data, lazy:bool=False, keep_dict:bool=True, identity_map:IdentityMap=None):
         '''
         A project.
         '''
         # data
         self.dict = data
+        self._identity_map = identity_map   # shares the author
 
         self.id: int =                          data['id']
         self.title: str =                       data['title']
@@ -318,30 +531,44 @@ class Project:
         self.remixes: int =                     data['remixesCount']
         self.comments: int =                    data['commentsCount']
         self.is_deleted: bool =                 data['isDeleted'] != 0
-        self.author: ProfilePreview =           ProfilePreview(data['author'])
-        self.image: PreviewImage =              None if data['previewImages']['large'] == None\
-                                                else PreviewImage(data['previewImages'])
-        self.reactions: Reactions =             Reactions(data['reactions'])
-        self.remix_enabled: bool =              data['remix']['isRemixEnabled'] != 0
-        self.original_project: RemixedProject = None if data['remix']['originalProject'] == None\
-                                                else RemixedProject(data['remix']['originalProject'])
-        self.uploads: list =                    [Upload(i) for i in data['uploads']]
+        self.remix_enabled: bool =              None if data.get('remix') is None\
+                                                else data['remix']['isRemixEnabled'] != 0
         self.url: str =                         f'https://learn.algoritmika.org/community?projectId={self.id}'
         self.meta: dict =                       data['meta'] if type(data['meta']) == dict else {} # that's just how they work
 
-        # date
-        date = [int(i) for i in data['createdAt'][0:19].split('T')[0].split('-')]
-        time = [int(i) for i in data['createdAt'][0:19].split('T')[1].split(':')]
-        self.created_at: datetime.datetime = datetime.datetime(
-            year=date[0], month=date[1], day=date[2],
-            hour=time[0], minute=time[1], second=time[2]
-        )
-        date = [int(i) for i in data['updatedAt'][0:19].split('T')[0].split('-')]
-        time = [int(i) for i in data['updatedAt'][0:19].split('T')[1].split(':')]
-        self.updated_at: datetime.datetime = datetime.datetime(
-            year=date[0], month=date[1], day=date[2],
-            hour=time[0], minute=time[1], second=time[2]
-        )
+        self._load(lazy, keep_dict)
+
+    @lazy_attribute
+    def _author(self) -> ProfilePreview:
+        return _preview(self.dict['author'], self._identity_map)
+
+    @lazy_attribute
+    def _image(self) -> PreviewImage:
+        return None if self.dict['previewImages']['large'] == None\
+               else PreviewImage(self.dict['previewImages'])
+
+    @lazy_attribute
+    def _reactions(self) -> Reactions:
+        return Reactions(self.dict['reactions'])
+
+    @lazy_attribute
+    def _original_project(self) -> RemixedProject:
+        remix = self.dict.get('remix')
+        return None if remix is None or remix['originalProject'] == None\
+               else RemixedProject(remix['originalProject'])
+
+    @lazy_attribute
+    def _uploads(self) -> list | None:
+        return None if self.dict.get('uploads') is None\
+               else [Upload(i) for i in self.dict['uploads']]
+
+    @lazy_attribute
+    def _created_at(self) -> datetime.datetime:
+        return _parse_datetime(self.dict['createdAt'])
+
+    @lazy_attribute
+    def _updated_at(self) -> datetime.datetime:
+        return _parse_datetime(self.dict['updatedAt'])
 
     def __str__(self) -> str:
         return self.title
@@ -352,8 +579,10 @@ class Project:
 
 # comments
 
-class Comment:
-    def __init__(self, data):
+class Comment(Model):
+    __slots__ = ('dict', 'id', 'message', 'author', 'children', 'created_at', '_options')
+
+    def __init__(self, data, lazy:bool=False, keep_dict:bool=True, identity_map:IdentityMap=None):
         '''
         A comment.
         '''
@@ -362,16 +591,21 @@ class Comment:
 
         self.id: int =                data['id']
         self.message: str =           data['message']
-        self.author: ProfilePreview = ProfilePreview(data['author'])
-        self.children: list =         [Comment(i) for i in data['children']]
+        self._options =               (lazy, keep_dict, identity_map)   # passed down to replies
 
-        # date
-        date = [int(i) for i in data['createdAt'][0:19].split('T')[0].split('-')]
-        time = [int(i) for i in data['createdAt'][0:19].split('T')[1].split(':')]
-        self.created_at: datetime.datetime = datetime.datetime(
-            year=date[0], month=date[1], day=date[2],
-            hour=time[0], minute=time[1], second=time[2]
-        )
+        self._load(lazy, keep_dict)
+
+    @lazy_attribute
+    def _author(self) -> ProfilePreview:
+        return _preview(self.dict['author'], self._options[2])
+
+    @lazy_attribute
+    def _children(self) -> list:
+        return [Comment(i, *self._options) for i in self.dict['children']]
+
+    @lazy_attribute
+    def _created_at(self) -> datetime.datetime:
+        return _parse_datetime(self.dict['createdAt'])
 
     def __str__(self) -> str:
         return self.message
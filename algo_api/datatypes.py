@@ -35,4 +35,33 @@ EMOJI_WOW =            ':wow'
 
 TRENDS_DAY =           'day'
 TRENDS_WEEK =          'week'
-TRENDS_MONTH =         'month'
\ No newline at end of file
+TRENDS_MONTH =         'month'
+
+BALANCE_ROUND_ROBIN =  'round_robin'
+BALANCE_LEAST_LOADED = 'least_loaded'
+
+EDGE_FRIEND =          0
+EDGE_CLASSMATE =       1
+
+RANK_LIKES =           'likes'
+RANK_VIEWS =           'views'
+RANK_REACTIONS =       'reactions'
+RANK_COMMENTS =        'comments'
+RANK_REMIXES =         'remixes'
+
+EXPAND_UPLOADS =       'uploads'
+EXPAND_REMIX =         'remix'
+EXPAND_STATS =         'stats'
+EXPAND_AVATARS =       'avatars'
+EXPAND_BRANCH =        'branch'
+EXPAND_SETTINGS =      'settings'
+EXPAND_LOCATIONS =     'locations'
+EXPAND_PERMISSIONS =   'permissions'
+EXPAND_AVATAR =        'avatar'
+EXPAND_REFERRAL =      'referral'
+EXPAND_COURSE =        'course'
+
+PROJECT_TYPES = (
+    TYPE_DESIGN, TYPE_GAMEDESIGN, TYPE_IMAGES, TYPE_PRESENTATION, TYPE_PYTHON,
+    TYPE_SCRATCH, TYPE_UNITY, TYPE_VIDEO, TYPE_VSCODE, TYPE_WEBSITE
+)
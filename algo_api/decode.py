@@ -0,0 +1,114 @@
+import json
+import re
+
+# picking the fastest installed json library
+try:
+    import orjson
+    JSON_BACKEND = 'orjson'
+    loads = orjson.loads
+    dumps = orjson.dumps
+except ImportError:
+    try:
+        import ujson
+        JSON_BACKEND = 'ujson'
+        loads = ujson.loads
+        dumps = lambda obj: ujson.dumps(obj, ensure_ascii=False).encode()
+    except ImportError:
+        JSON_BACKEND = 'json'
+        loads = json.loads
+        dumps = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+_ITEMS = re.compile(rb'"items"\s*:\s*\[')
+# a closing bracket followed by the start of the next array element
+# or by the end of the array
+_END = re.compile(rb'[}\]](?=\s*(?:,\s*[{\[]|\]))')
+_SKIP = b' \t\r\n,'
+
+
+def iter_items(chunks, key:bytes=b'items'):
+    '''
+    Decodes elements of the first `key` array of a JSON
+    response one by one as the chunks of the body arrive,
+    so that the whole body is never kept in memory.
+
+    `chunks` is an iterable of `bytes`, for example
+    `Response.iter_content()` of a streamed response.
+    '''
+    start_re = _ITEMS if key == b'items' else\
+               re.compile(b'"'+re.escape(key)+rb'"\s*:\s*\[')
+    chunks = iter(chunks)
+    buf = b''
+
+    # looking for the start of the array
+    while True:
+        match = start_re.search(buf)
+        if match is not None:
+            buf = buf[match.end():]
+            break
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        # the key might be split between two chunks
+        buf = buf[-64:] + chunk
+
+    pos = 0        # start of the current element
+    scan = 0       # how far the element was checked without counting brackets
+    counted = 0    # how far the brackets of the element were counted
+    depth = 0
+
+    while True:
+        # skipping separators between elements
+        while pos < len(buf) and buf[pos] in _SKIP:
+            pos += 1
+        scan = max(scan, pos)
+        counted = max(counted, pos)
+
+        if pos < len(buf):
+            if buf[pos] == 0x5d: # ]
+                return
+            if buf[pos] not in b'{[':
+                raise ValueError('Only arrays of objects and arrays can be streamed')
+
+            # every closing bracket followed by a separator might be the end of
+            # the element, the decoder tells which one actually is. the ones
+            # where brackets are balanced are tried first, brackets in strings
+            # make the others worth a try only if none of those fit. brackets
+            # at the end of a chunk are checked once the next one arrives
+            item = end = None
+            for match in _END.finditer(buf, counted):
+                stop = match.start()+1
+                depth += buf.count(b'{', counted, stop) + buf.count(b'[', counted, stop)\
+                       - buf.count(b'}', counted, stop) - buf.count(b']', counted, stop)
+                counted = stop
+                if depth != 0:
+                    continue
+                try:
+                    item = loads(buf[pos:stop])
+                except ValueError:
+                    continue
+                end = stop
+                break
+            else:
+                for match in _END.finditer(buf, scan):
+                    scan = match.start()+1
+                    try:
+                        item = loads(buf[pos:scan])
+                    except ValueError:
+                        continue
+                    end = scan
+                    break
+
+            if end is not None:
+                yield item
+                pos = scan = counted = end
+                depth = 0
+                continue
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError('Unexpected end of the JSON response')
+        # dropping what was already decoded
+        buf = buf[pos:] + chunk
+        scan -= pos
+        counted -= pos
+        pos = 0
@@ -0,0 +1,268 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import requests
+from urllib.parse import urlsplit
+from .api import *
+from .api import _map_many
+from .classes import *
+from .errors import *
+
+
+def _extension(url:str) -> str:
+    return os.path.splitext(urlsplit(url).path)[1]
+
+
+def _link(source:str, target:str):
+    '''
+    Makes `target` point to the same content as `source`,
+    with a hard link if the file system supports it.
+    '''
+    temp = target+'.tmp'
+    if os.path.exists(temp):
+        os.remove(temp)
+    try:
+        os.link(source, temp)
+    except OSError:
+        shutil.copyfile(source, temp)
+    os.replace(temp, target)
+
+
+def _range_start(res:requests.Response) -> int | None:
+    # Content-Range: bytes 400-999/1000
+    value = res.headers.get('Content-Range', '')
+    if not value.startswith('bytes '):
+        return None
+    start = value[6:].split('-', 1)[0]
+    return int(start) if start.isdigit() else None
+
+
+class DownloadResult:
+    __slots__ = ('downloaded', 'resumed', 'deduplicated', 'skipped', 'errors', 'bytes')
+
+    def __init__(self):
+        '''
+        What happened to the files passed to
+        `Downloader.download()`.
+        '''
+        self.downloaded: list =   []
+        self.resumed: list =      []
+        self.deduplicated: list = []
+        self.skipped: list =      []
+        self.errors: dict =       {}
+        self.bytes: int =         0     # received over the network
+
+
+class Downloader:
+    def __init__(self, session:Session, path:str, workers:int=8, previews:bool=True):
+        '''
+        Downloads uploads and preview images of projects
+        into the `path` directory, `workers` files at a time.
+
+        Files are streamed to disk in chunks, and partially
+        downloaded ones are resumed with a `Range` request on
+        the next run. Files whose `updated_at` hasn't changed
+        since the last run are skipped, and partial downloads
+        of an older version are started over.
+
+        The content of every file is stored once under
+        `objects/` by its SHA-256 hash, and
+        `projects/<id>/` contains links to it.
+        '''
+        if type(workers) != int:
+            raise TypeError(f'\'workers\' should be int')
+
+        self.session =        session
+        self.path: str =      path
+        self.workers: int =   workers
+        self.previews: bool = previews
+
+        for i in ('objects', 'partial', 'projects'):
+            os.makedirs(os.path.join(path, i), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db =   sqlite3.connect(os.path.join(path, 'manifest.db'), check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'url TEXT PRIMARY KEY, updated_at TEXT, sha256 TEXT, size INTEGER, path TEXT)'
+        )
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def files(self, project:Project) -> list:
+        '''
+        Returns `(url, updated_at, path)` of every file of
+        the project that should be downloaded, `path` being
+        relative to the download directory.
+        '''
+        folder = os.path.join('projects', str(project.id))
+        result = [
+            (i.url, i.updated_at.isoformat(), os.path.join(folder, f'{i.id}_{os.path.basename(i.filename)}'))
+            for i in project.uploads or []
+        ]
+        if self.previews and project.image is not None:
+            updated_at = project.updated_at.isoformat()
+            result.append((
+                project.image.url, updated_at,
+                os.path.join(folder, 'preview'+_extension(project.image.url))
+            ))
+            result.append((
+                project.image.small_url, updated_at,
+                os.path.join(folder, 'preview_small'+_extension(project.image.small_url))
+            ))
+        return result
+
+    def _object(self, sha256:str) -> str:
+        return os.path.join(self.path, 'objects', sha256[:2], sha256)
+
+    def _partial(self, url:str, updated_at:str) -> str:
+        '''
+        Returns the path of the partial file for this version
+        of the file, removing partial files of older versions
+        so that they are never continued with new content.
+        '''
+        name = hashlib.sha1(url.encode()).hexdigest()
+        version = hashlib.sha1(updated_at.encode()).hexdigest()[:16]
+        folder = os.path.join(self.path, 'partial')
+        for i in os.listdir(folder):
+            if i.startswith(name) and i != f'{name}.{version}':
+                os.remove(os.path.join(folder, i))
+        return os.path.join(folder, f'{name}.{version}')
+
+    def _entry(self, url:str) -> tuple:
+        with self._lock:
+            return self._db.execute(
+                'SELECT updated_at, sha256, size, path FROM files WHERE url = ?', (url,)
+            ).fetchone()
+
+    def _fetch(self, url:str, partial:str) -> tuple:
+        '''
+        Streams the file into `partial`, continuing it if
+        it exists. Returns `(sha256, size, received, resumed)`.
+        '''
+        hash = hashlib.sha256()
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset > 0 else {}
+
+        res = self.session._send('GET', url, stream=True, headers=headers)
+        try:
+            if res.status_code == 416:
+                # the partial file is broken or the file got shorter
+                os.remove(partial)
+                res.close()
+                return self._fetch(url, partial)
+            if res.status_code not in (200, 206):
+                self.session._raise(res)
+
+            resumed = res.status_code == 206
+            if resumed and _range_start(res) != offset:
+                # the server answered a different range than asked
+                # for, so the partial file can't be trusted
+                os.remove(partial)
+                res.close()
+                return self._fetch(url, partial)
+            if resumed:
+                with open(partial, 'rb') as f:
+                    for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                        hash.update(chunk)
+            else:
+                offset = 0
+
+            received = 0
+            with open(partial, 'ab' if resumed else 'wb') as f:
+                for chunk in res.iter_content(STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+                    hash.update(chunk)
+                    received += len(chunk)
+        finally:
+            res.close()
+        return hash.hexdigest(), offset+received, received, resumed
+
+    def _download(self, file:tuple) -> tuple:
+        url, updated_at, path = file
+        target = os.path.join(self.path, path)
+
+        entry = self._entry(url)
+        if entry is not None and entry[0] == updated_at:
+            if not os.path.exists(target) and os.path.exists(self._object(entry[1])):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _link(self._object(entry[1]), target)
+            return 'skipped', 0
+
+        partial = self._partial(url, updated_at)
+        sha256, size, received, resumed = self._fetch(url, partial)
+
+        blob = self._object(sha256)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        duplicate = os.path.exists(blob)
+        if duplicate:
+            os.remove(partial)
+        else:
+            os.replace(partial, blob)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _link(blob, target)
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                (url, updated_at, sha256, size, path)
+            )
+            self._db.commit()
+
+        if duplicate:
+            return 'deduplicated', received
+        return 'resumed' if resumed else 'downloaded', received
+
+    def download(self, projects) -> DownloadResult:
+        '''
+        Downloads files of the passed projects and returns
+        a `DownloadResult` with their URLs.
+
+        Files that couldn't be downloaded are put into
+        `errors` and are tried again on the next call.
+        '''
+        files = {}
+        for project in projects:
+            for file in self.files(project):
+                files[file[0]] = file
+
+        def download(url):
+            try:
+                return self._download(files[url])
+            except (requests.RequestException, OSError) as e:
+                return e
+
+        result = DownloadResult()
+        self.session.transport.ensure_pool(self.workers)
+        for url, status in _map_many(download, files, self.workers, False):
+            if isinstance(status, Exception):
+                result.errors[url] = status
+                continue
+            status, received = status
+            getattr(result, status).append(url)
+            result.bytes += received
+        return result
+
+    def path_of(self, url:str) -> str | None:
+        '''
+        Returns the local path of a downloaded file, or
+        `None` if it wasn't downloaded.
+        '''
+        entry = self._entry(url)
+        return None if entry is None else os.path.join(self.path, entry[3])
+
+    def close(self):
+        '''
+        Closes the manifest.
+        '''
+        self._db.close()
@@ -1,4 +1,3 @@
-
 class DefaultException(Exception):
     def __init__(self, message):
         super().__init__(message)
@@ -7,4 +6,10 @@ class UnknownException       (DefaultException): pass
 class SessionClosed          (DefaultException): pass
 class InvalidCredentials     (DefaultException): pass
 class NotImplementedException(DefaultException): pass
-class AlreadyLoggedIn        (DefaultException): pass
\ No newline at end of file
+class AlreadyLoggedIn        (DefaultException): pass
+
+# http errors
+class Unauthorized           (UnknownException): pass
+class NotFound               (UnknownException): pass
+class RateLimited            (UnknownException): pass
+class ServerError            (UnknownException): pass
@@ -0,0 +1,267 @@
+import json
+import os
+import struct
+from array import array
+from .api import _map_many
+from .datatypes import *
+from .errors import *
+
+_MAGIC = b'ALGOGRF1'
+_HEADER = struct.Struct('<I')
+
+
+class Bitmap:
+    __slots__ = ('_bits', '_count')
+
+    def __init__(self, data:bytes=b''):
+        '''
+        A set of non-negative ints stored as one bit per
+        possible value.
+        '''
+        self._bits = bytearray(data)
+        self._count = int.from_bytes(self._bits, 'little').bit_count()
+
+    def add(self, value:int):
+        byte, bit = divmod(value, 8)
+        if byte >= len(self._bits):
+            # growing by at least half to keep appends cheap
+            self._bits.extend(bytes(max(byte+1, len(self._bits)*3//2) - len(self._bits)))
+        if not self._bits[byte] >> bit & 1:
+            self._bits[byte] |= 1 << bit
+            self._count += 1
+
+    def __contains__(self, value:int) -> bool:
+        byte, bit = divmod(value, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] >> bit & 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+
+class SocialGraph:
+    __slots__ = ('nodes', 'offsets', 'targets', 'kinds', '_positions')
+
+    def __init__(self, nodes:array, offsets:array, targets:array, kinds:array):
+        '''
+        Users and the links between them in CSR form:
+        links of `nodes[i]` are `targets[offsets[i]:offsets[i+1]]`
+        with their kinds in `kinds`.
+        '''
+        self.nodes =      nodes
+        self.offsets =    offsets
+        self.targets =    targets
+        self.kinds =      kinds
+        self._positions = {id: i for i, id in enumerate(nodes)}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, id:int) -> bool:
+        return id in self._positions
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def neighbors(self, id:int, kind:int=None) -> list:
+        '''
+        Returns IDs of users linked to the user with the
+        passed ID, only of the passed kind if it's set.
+
+        Raises `KeyError` if the user wasn't crawled.
+        '''
+        position = self._positions[id]
+        start, end = self.offsets[position], self.offsets[position+1]
+        if kind is None:
+            return self.targets[start:end].tolist()
+        return [self.targets[i] for i in range(start, end) if self.kinds[i] == kind]
+
+    def friends(self, id:int) -> list:
+        return self.neighbors(id, EDGE_FRIEND)
+
+    def classmates(self, id:int) -> list:
+        return self.neighbors(id, EDGE_CLASSMATE)
+
+    def degree(self, id:int) -> int:
+        position = self._positions[id]
+        return self.offsets[position+1] - self.offsets[position]
+
+    def edges(self):
+        '''
+        Yields all links as `(source, target, kind)` tuples.
+        '''
+        for position, source in enumerate(self.nodes):
+            for i in range(self.offsets[position], self.offsets[position+1]):
+                yield source, self.targets[i], self.kinds[i]
+
+
+class GraphCrawler:
+    def __init__(self, session, seeds:list, max_depth:int=2, max_nodes:int=10000,
+                 workers:int=8, classmates:bool=True, on_profile=None):
+        '''
+        Crawls friends (and classmates) of users breadth-first,
+        starting from the users with `seeds` IDs.
+
+        `session` is a `Session` or a `SessionPool`. Profiles
+        of each level are fetched `workers` at a time, and
+        `on_profile(data)` is called with every fetched
+        profile dict.
+        '''
+        if type(max_depth) != int:
+            raise TypeError(f'\'max_depth\' should be int')
+        if type(max_nodes) != int:
+            raise TypeError(f'\'max_nodes\' should be int')
+
+        self.session =          session
+        self.max_depth: int =   max_depth
+        self.max_nodes: int =   max_nodes
+        self.workers: int =     workers
+        self.classmates: bool = classmates
+        self.on_profile =       on_profile
+
+        self.depth: int =       0
+        self.visited =          Bitmap()
+        self.frontier: list =   []     # not yet fetched users of the current level
+        self.next: list =       []     # users of the next level
+        self.errors: dict =     {}
+
+        self._nodes =   array('q')
+        self._offsets = array('q', [0])
+        self._targets = array('q')
+        self._kinds =   array('b')
+
+        for id in seeds:
+            if type(id) != int:
+                raise TypeError(f'\'seeds\' should be a list of ints')
+            self._enqueue(id, self.frontier)
+
+    @property
+    def done(self) -> bool:
+        return len(self.frontier) == 0 and (len(self.next) == 0 or self.depth >= self.max_depth)
+
+    def _enqueue(self, id:int, level:list):
+        if id in self.visited or len(self.visited) >= self.max_nodes:
+            return
+        self.visited.add(id)
+        level.append(id)
+
+    def _add(self, id:int, data:dict):
+        links = [(i['id'], EDGE_FRIEND) for i in data['friends']]
+        if self.classmates:
+            links += [(i['id'], EDGE_CLASSMATE) for i in data['classmates']]
+
+        self._nodes.append(id)
+        for target, kind in links:
+            self._targets.append(target)
+            self._kinds.append(kind)
+            if self.depth < self.max_depth:
+                self._enqueue(target, self.next)
+        self._offsets.append(len(self._targets))
+
+    def step(self, count:int=None) -> int:
+        '''
+        Fetches up to `count` profiles of the current level
+        (all of them if `count` is `None`), moving on to the
+        next level once it's done. Returns the number of
+        fetched profiles.
+        '''
+        if len(self.frontier) == 0:
+            if self.done:
+                return 0
+            self.frontier, self.next = self.next, []
+            self.depth += 1
+
+        count = len(self.frontier) if count is None else count
+        batch, self.frontier = self.frontier[:count], self.frontier[count:]
+
+        self.session.transport.ensure_pool(self.workers)
+        for id, data in _map_many(
+            lambda id: self.session.get_profile(id, raw=True), batch, self.workers, True
+        ):
+            if isinstance(data, Exception):
+                self.errors[id] = data
+                continue
+            if self.on_profile is not None:
+                self.on_profile(data)
+            self._add(id, data)
+
+        return len(batch)
+
+    def crawl(self, checkpoint:str=None, every:int=1000) -> SocialGraph:
+        '''
+        Crawls until the depth or node limit is reached
+        and returns the graph.
+
+        If `checkpoint` is passed, the state is saved there
+        after every `every` profiles.
+        '''
+        while not self.done:
+            self.step(every)
+            if checkpoint is not None:
+                self.save(checkpoint)
+        return self.graph()
+
+    def graph(self) -> SocialGraph:
+        '''
+        Returns the graph of all profiles fetched so far.
+        '''
+        return SocialGraph(
+            array('q', self._nodes), array('q', self._offsets),
+            array('q', self._targets), array('b', self._kinds)
+        )
+
+    def save(self, path:str):
+        '''
+        Saves the state of the crawl, so that it can be
+        continued later with `GraphCrawler.load()`.
+        '''
+        parts = [
+            self.visited.to_bytes(), self._nodes.tobytes(), self._offsets.tobytes(),
+            self._targets.tobytes(), self._kinds.tobytes()
+        ]
+        header = json.dumps({
+            'depth': self.depth, 'max_depth': self.max_depth, 'max_nodes': self.max_nodes,
+            'classmates': self.classmates, 'frontier': self.frontier, 'next': self.next,
+            'errors': list(self.errors), 'sizes': [len(i) for i in parts]
+        }).encode()
+
+        temp = path+'.tmp'
+        with open(temp, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(len(header)))
+            f.write(header)
+            for i in parts:
+                f.write(i)
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path:str, session, workers:int=8, on_profile=None):
+        '''
+        Continues a crawl saved with `save()`.
+
+        Users whose profiles couldn't be fetched are
+        tried again.
+        '''
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f'{path} is not a crawl checkpoint')
+            header = json.loads(f.read(_HEADER.unpack(f.read(_HEADER.size))[0]))
+            parts = [f.read(i) for i in header['sizes']]
+
+        crawler = cls(
+            session, [], header['max_depth'], header['max_nodes'],
+            workers, header['classmates'], on_profile
+        )
+        crawler.depth = header['depth']
+        crawler.visited = Bitmap(parts[0])
+        crawler.frontier = header['errors'] + header['frontier']
+        crawler.next = header['next']
+        for part, data in zip(
+            (crawler._nodes, crawler._offsets, crawler._targets, crawler._kinds), parts[1:]
+        ):
+            del part[:]
+            part.frombytes(data)
+        return crawler
@@ -0,0 +1,140 @@
+import heapq
+import threading
+from .classes import *
+from .datatypes import *
+
+RANKS = (RANK_LIKES, RANK_VIEWS, RANK_REACTIONS, RANK_COMMENTS, RANK_REMIXES)
+
+
+def _scores(project:Project) -> tuple:
+    reactions = project.reactions
+    return (
+        project.likes, project.views,
+        reactions.likes + reactions.loves + reactions.fires,
+        project.comments, project.remixes
+    )
+
+
+class _TopK:
+    __slots__ = ('k', 'heap', 'scores')
+
+    def __init__(self, k:int):
+        self.k =      k
+        self.heap =   []    # (score, id) min-heap of the best `k` projects
+        self.scores = {}    # id: score of projects in the heap
+
+    def push(self, id:int, score:int):
+        '''
+        Returns the ID of the project that dropped out of
+        the top, the passed one if it didn't get in, or
+        `None`.
+        '''
+        old = self.scores.get(id)
+        if old is not None:
+            if old != score:
+                self.scores[id] = score
+                self.heap = [(j, i) for i, j in self.scores.items()]
+                heapq.heapify(self.heap)
+            return None
+
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (score, id))
+        elif (score, id) > self.heap[0]:
+            _, dropped = heapq.heapreplace(self.heap, (score, id))
+            del self.scores[dropped]
+            self.scores[id] = score
+            return dropped
+        else:
+            return id
+        self.scores[id] = score
+        return None
+
+
+class Leaderboard:
+    def __init__(self, k:int=100):
+        '''
+        Keeps the `k` best projects by likes, views,
+        reactions, comments and remixes, overall and for
+        every project type.
+
+        Rankings are updated incrementally with `update()`
+        and `refresh()`, so `top()` never fetches anything.
+        '''
+        if type(k) != int:
+            raise TypeError(f'\'k\' should be int')
+        if k < 1:
+            raise ValueError('\'k\' should be at least 1')
+
+        self.k: int =        k
+        self.trending: dict = {}
+        self._tops =         {}     # (rank, type or None): _TopK
+        self._projects =     {}     # id: [project, number of tops it is in]
+        self._lock =         threading.Lock()
+
+    def _top(self, rank:str, type:str) -> _TopK:
+        top = self._tops.get((rank, type))
+        if top is None:
+            top = self._tops[(rank, type)] = _TopK(self.k)
+        return top
+
+    def update(self, projects):
+        '''
+        Adds projects to the rankings or updates their
+        scores if they are already ranked.
+        '''
+        with self._lock:
+            for project in projects:
+                id = project.id
+                entry = self._projects.get(id)
+                if entry is None:
+                    entry = self._projects[id] = [project, 0]
+                else:
+                    entry[0] = project
+
+                for rank, score in zip(RANKS, _scores(project)):
+                    for type in (None, project.type):
+                        top = self._top(rank, type)
+                        is_new = id not in top.scores
+                        dropped = top.push(id, score)
+                        if is_new and dropped != id:
+                            entry[1] += 1
+                        if dropped is not None and dropped != id:
+                            self._release(dropped)
+
+                if entry[1] == 0:
+                    del self._projects[id]
+
+    def _release(self, id:int):
+        entry = self._projects[id]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._projects[id]
+
+    def refresh(self, session):
+        '''
+        Fetches trending projects for all intervals with
+        `Session.get_hall_of_fame()` and adds them to the
+        rankings. They are also kept in `trending`.
+        '''
+        self.trending = session.get_hall_of_fame()
+        for projects in self.trending.values():
+            self.update(projects)
+
+    def top(self, rank:str=RANK_LIKES, n:int=10, type:str=None) -> list:
+        '''
+        Returns the best `n` projects by `rank`, only of
+        the passed type if it's set.
+        '''
+        if rank not in RANKS:
+            raise ValueError(f'Unknown rank: {rank}')
+        if n > self.k:
+            raise ValueError(f'Only the best {self.k} projects are kept')
+
+        with self._lock:
+            top = self._tops.get((rank, type))
+            if top is None:
+                return []
+            return [self._projects[id][0] for _, id in heapq.nlargest(n, top.heap)]
+
+    def __len__(self) -> int:
+        return len(self._projects)
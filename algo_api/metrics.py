@@ -0,0 +1,291 @@
+import bisect
+import re
+import threading
+from urllib.parse import urlsplit
+
+# upper bounds of latency buckets in seconds, from 1 ms to about 3 minutes
+LATENCY_BUCKETS = tuple(0.001 * 2**(i/2) for i in range(36))
+
+_ID = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_template(url:str) -> str:
+    '''
+    Returns the path of the URL with numeric IDs
+    replaced by `{id}`, so that requests to the same
+    endpoint are grouped together.
+    '''
+    return _ID.sub('/{id}', urlsplit(url.strip()).path)
+
+
+class Hook:
+    '''
+    Base class for objects passed to `Session(hooks=...)`.
+
+    Every method is a no-op, subclasses override the
+    ones they need. Hooks are called from the thread that
+    sends the request, so they should be thread-safe.
+    '''
+    def before_request(self, method:str, url:str):
+        '''
+        Called before every attempt to send a request.
+        '''
+
+    def after_response(self, method:str, url:str, res, elapsed:float):
+        '''
+        Called when a response is received, including
+        failed ones. For streamed responses it's called
+        before the body is read.
+        '''
+
+    def on_error(self, method:str, url:str, error:Exception, elapsed:float):
+        '''
+        Called when a request fails to connect or
+        times out.
+        '''
+
+    def on_parse(self, url:str, size:int, elapsed:float):
+        '''
+        Called after a JSON response is parsed.
+        '''
+
+    def on_build(self, model:str, count:int, elapsed:float):
+        '''
+        Called after `count` objects of the `model` class
+        are built from the parsed data.
+        '''
+
+
+class Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        '''
+        Latency histogram with `LATENCY_BUCKETS` bounds.
+        '''
+        self.counts = [0] * (len(LATENCY_BUCKETS)+1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value:float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q:float) -> float:
+        '''
+        Returns the approximate `q` quantile (0 to 1),
+        interpolated inside the bucket it falls into.
+        '''
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count > 0 and seen + count >= rank:
+                low = LATENCY_BUCKETS[i-1] if i > 0 else 0.0
+                high = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+                return min(self.max, low + (high-low) * (rank-seen) / count)
+            seen += count
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total': self.sum,
+            'mean':  self.sum / self.count if self.count else 0.0,
+            'p50':   self.percentile(0.5),
+            'p95':   self.percentile(0.95),
+            'p99':   self.percentile(0.99),
+            'max':   self.max,
+        }
+
+
+class _Endpoint:
+    __slots__ = ('count', 'errors', 'statuses', 'sent', 'received', 'decoded', 'latency')
+
+    def __init__(self):
+        self.count =    0
+        self.errors =   0
+        self.statuses = {}
+        self.sent =     0
+        self.received = 0   # as transferred, possibly compressed
+        self.decoded =  0
+        self.latency =  Histogram()
+
+
+def _body_size(body) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    return 0
+
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+class Metrics(Hook):
+    def __init__(self):
+        '''
+        Collects request counts, errors, bytes transferred
+        and latency histograms per endpoint, as well as time
+        spent parsing JSON and building objects.
+
+        Pass it to a session as `Session(hooks=[metrics])`.
+        One instance can be shared between sessions.
+        '''
+        self._endpoints = {}    # (method, endpoint template): _Endpoint
+        self._parsing =   {}    # endpoint template: [responses, bytes, seconds]
+        self._building =  {}    # model name: [calls, objects, seconds]
+        self._lock =      threading.Lock()
+
+    def _endpoint(self, method:str, url:str) -> _Endpoint:
+        key = (method, endpoint_template(url))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _Endpoint()
+        return stats
+
+    def after_response(self, method:str, url:str, res, elapsed:float):
+        if res._content_consumed:
+            decoded = len(res.content)
+            received = res.raw.tell() if hasattr(res.raw, 'tell') else decoded
+        else:
+            # the body of a streamed response isn't read yet
+            decoded = received = int(res.headers.get('Content-Length') or 0)
+        with self._lock:
+            stats = self._endpoint(method, url)
+            stats.count += 1
+            if res.status_code >= 400:
+                stats.errors += 1
+            stats.statuses[res.status_code] = stats.statuses.get(res.status_code, 0) + 1
+            stats.sent += _body_size(res.request.body)
+            stats.received += received
+            stats.decoded += decoded
+            stats.latency.add(elapsed)
+
+    def on_error(self, method:str, url:str, error:Exception, elapsed:float):
+        with self._lock:
+            stats = self._endpoint(method, url)
+            stats.count += 1
+            stats.errors += 1
+            name = type(error).__name__
+            stats.statuses[name] = stats.statuses.get(name, 0) + 1
+            stats.latency.add(elapsed)
+
+    def on_parse(self, url:str, size:int, elapsed:float):
+        key = endpoint_template(url)
+        with self._lock:
+            stats = self._parsing.setdefault(key, [0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += size
+            stats[2] += elapsed
+
+    def on_build(self, model:str, count:int, elapsed:float):
+        with self._lock:
+            stats = self._building.setdefault(model, [0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += count
+            stats[2] += elapsed
+
+    def reset(self):
+        '''
+        Clears all collected metrics.
+        '''
+        with self._lock:
+            self._endpoints.clear()
+            self._parsing.clear()
+            self._building.clear()
+
+    def to_dict(self) -> dict:
+        '''
+        Returns all metrics as a dict. Endpoints are sorted
+        by the total time spent on them, the slowest first.
+        '''
+        with self._lock:
+            endpoints = sorted(self._endpoints.items(), key=lambda i: -i[1].latency.sum)
+            return {
+                'requests': {
+                    f'{method} {endpoint}': {
+                        'count':    stats.count,
+                        'errors':   stats.errors,
+                        'statuses': dict(stats.statuses),
+                        'sent':     stats.sent,
+                        'received': stats.received,
+                        'decoded':  stats.decoded,
+                        'latency':  stats.latency.to_dict(),
+                    } for (method, endpoint), stats in endpoints
+                },
+                'parsing': {
+                    endpoint: {'count': count, 'bytes': size, 'seconds': seconds}
+                    for endpoint, (count, size, seconds) in self._parsing.items()
+                },
+                'building': {
+                    model: {'count': count, 'objects': objects, 'seconds': seconds}
+                    for model, (count, objects, seconds) in self._building.items()
+                },
+            }
+
+    def to_prometheus(self, prefix:str='algo_api') -> str:
+        '''
+        Returns all metrics in the Prometheus text
+        exposition format.
+        '''
+        lines = []
+        def family(name:str, kind:str, help:str):
+            lines.append(f'# HELP {prefix}_{name} {help}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+
+        with self._lock:
+            endpoints = [
+                (f'method="{_label(method)}",endpoint="{_label(endpoint)}"', stats)
+                for (method, endpoint), stats in sorted(self._endpoints.items())
+            ]
+
+            family('requests_total', 'counter', 'Requests sent, including retries.')
+            for labels, stats in endpoints:
+                lines.append(f'{prefix}_requests_total{{{labels}}} {stats.count}')
+
+            family('request_errors_total', 'counter', 'Failed requests and error responses.')
+            for labels, stats in endpoints:
+                lines.append(f'{prefix}_request_errors_total{{{labels}}} {stats.errors}')
+
+            family('request_bytes_total', 'counter', 'Bytes of request and response bodies, received ones before and after decompression.')
+            for labels, stats in endpoints:
+                lines.append(f'{prefix}_request_bytes_total{{{labels},direction="sent"}} {stats.sent}')
+                lines.append(f'{prefix}_request_bytes_total{{{labels},direction="received"}} {stats.received}')
+                lines.append(f'{prefix}_request_bytes_total{{{labels},direction="decoded"}} {stats.decoded}')
+
+            family('request_duration_seconds', 'histogram', 'Time until the response headers are received.')
+            for labels, stats in endpoints:
+                total = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.latency.counts):
+                    total += count
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound:.6g}"}} {total}')
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+                lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {stats.latency.sum}')
+                lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {stats.latency.count}')
+
+            family('parse_seconds_total', 'counter', 'Time spent parsing JSON responses.')
+            for endpoint, (_, _, seconds) in sorted(self._parsing.items()):
+                lines.append(f'{prefix}_parse_seconds_total{{endpoint="{_label(endpoint)}"}} {seconds}')
+
+            family('parse_bytes_total', 'counter', 'Bytes of parsed JSON responses.')
+            for endpoint, (_, size, _) in sorted(self._parsing.items()):
+                lines.append(f'{prefix}_parse_bytes_total{{endpoint="{_label(endpoint)}"}} {size}')
+
+            family('build_seconds_total', 'counter', 'Time spent building objects from parsed data.')
+            for model, (_, _, seconds) in sorted(self._building.items()):
+                lines.append(f'{prefix}_build_seconds_total{{model="{_label(model)}"}} {seconds}')
+
+            family('build_objects_total', 'counter', 'Objects built from parsed data.')
+            for model, (_, objects, _) in sorted(self._building.items()):
+                lines.append(f'{prefix}_build_objects_total{{model="{_label(model)}"}} {objects}')
+
+        return '\n'.join(lines)+'\n'
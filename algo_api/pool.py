@@ -0,0 +1,138 @@
+import threading
+from .api import *
+from .api import _iter_pages, _map_many
+from .errors import *
+from .classes import *
+from .datatypes import *
+from .transport import *
+
+class SessionPool:
+    def __init__(self, credentials:list, balance:str=BALANCE_ROUND_ROBIN,
+                 transport:Transport=None, **options):
+        '''
+        A pool of sessions logged into different accounts
+        that spreads read requests between them.
+
+        `credentials` is a list of `(login, password)` tuples.
+        `options` are passed to every `Session`.
+
+        If a session gets logged out, it is logged back in
+        and the request is repeated.
+        '''
+        if balance not in (BALANCE_ROUND_ROBIN, BALANCE_LEAST_LOADED):
+            raise ValueError(f'Unknown balance strategy: {balance}')
+        credentials = [tuple(i) for i in credentials]
+        if len(credentials) == 0:
+            raise ValueError('At least one account is needed')
+
+        self.credentials: list = credentials
+        self.balance: str =      balance
+        self.transport =         transport if transport is not None\
+                                 else Transport(pool_maxsize=max(10, len(credentials)))
+        self._owns_transport =   transport is None
+        self.sessions: list =    [
+            Session(login, password, transport=self.transport, **options)
+            for login, password in credentials
+        ]
+
+        self._lock =        threading.Lock()
+        self._next =        0
+        self._in_flight =   [0] * len(self.sessions)
+        self._generations = [0] * len(self.sessions)
+        self._relogin_locks = [threading.Lock() for _ in self.sessions]
+
+    def _acquire(self) -> tuple:
+        with self._lock:
+            if self.balance == BALANCE_ROUND_ROBIN:
+                index = self._next
+                self._next = (self._next+1) % len(self.sessions)
+            else:
+                index = min(range(len(self.sessions)), key=self._in_flight.__getitem__)
+            self._in_flight[index] += 1
+            return index, self._generations[index]
+
+    def _release(self, index:int):
+        with self._lock:
+            self._in_flight[index] -= 1
+
+    def _relogin(self, index:int, generation:int):
+        with self._relogin_locks[index]:
+            # another thread might have already logged it back in
+            if self._generations[index] != generation:
+                return
+
+            # other threads keep using the old connection
+            # session until the new one is swapped in
+            self.sessions[index]._relogin()
+            with self._lock:
+                self._generations[index] += 1
+
+    def _call(self, name:str, *args, **kwargs):
+        index, generation = self._acquire()
+        try:
+            try:
+                return getattr(self.sessions[index], name)(*args, **kwargs)
+            except (Unauthorized, SessionClosed):
+                self._relogin(index, generation)
+                return getattr(self.sessions[index], name)(*args, **kwargs)
+        finally:
+            self._release(index)
+
+    def close(self):
+        '''
+        Closes all sessions of the pool.
+        '''
+        for session in self.sessions:
+            if session.session != None:
+                session.close()
+        if self._owns_transport:
+            self.transport.close()
+
+
+    # actions
+    def get_profile(self, id:int, raw:bool=False, expand:list=None) -> Profile:
+        return self._call('get_profile', id, raw, expand)
+
+    def get_projects(self, id:int=None, page:int=1, per_page:int=50, sort=SORT_LATEST,
+                     raw:bool=False, expand:list=None, types:list=None) -> list:
+        return self._call('get_projects', id, page, per_page, sort, raw, expand, types)
+
+    def get_trending(self, interval:str, raw:bool=False, expand:list=None) -> list:
+        return self._call('get_trending', interval, raw, expand)
+
+    def get_hall_of_fame(self, raw:bool=False) -> dict:
+        return self._call('get_hall_of_fame', raw)
+
+    def get_project(self, id:int, expand:list=None) -> Project:
+        return self._call('get_project', id, expand)
+
+    def get_comments(self, id:int, page:int=1, per_page:int=50, raw:bool=False) -> list:
+        return self._call('get_comments', id, page, per_page, raw)
+
+    def get_all_comments(self, id:int, per_page:int=50, workers:int=8) -> CommentThread:
+        return self._call('get_all_comments', id, per_page, workers)
+
+    def iter_projects(self, id:int=None, sort=SORT_LATEST, per_page:int=50, limit:int=None,
+                      raw:bool=False, expand:list=None, types:list=None):
+        if id is not None and type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        return _iter_pages(
+            lambda page: self.get_projects(id, page, per_page, sort, raw, expand, types),
+            per_page, limit
+        )
+
+    def iter_comments(self, id:int, per_page:int=50, limit:int=None):
+        if type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        return _iter_pages(
+            lambda page: self.get_comments(id, page, per_page),
+            per_page, limit
+        )
+
+    def get_profiles_many(self, ids, workers:int=8, ordered:bool=True):
+        self.transport.ensure_pool(workers)
+        return _map_many(self.get_profile, ids, workers, ordered)
+
+    def get_projects_many(self, ids, workers:int=8, ordered:bool=True):
+        self.transport.ensure_pool(workers)
+        return _map_many(self.get_project, ids, workers, ordered)
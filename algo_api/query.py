@@ -0,0 +1,54 @@
+from urllib.parse import urlencode
+from .datatypes import *
+
+# what is expanded in responses unless the caller chooses otherwise
+PROJECT_EXPAND =      (EXPAND_UPLOADS, EXPAND_REMIX)
+TRENDING_EXPAND =     (EXPAND_REMIX,)
+PROFILE_EXPAND =      (EXPAND_STATS, EXPAND_AVATARS)
+SELF_PROFILE_EXPAND = (
+    EXPAND_BRANCH, EXPAND_SETTINGS, EXPAND_LOCATIONS, EXPAND_PERMISSIONS,
+    EXPAND_AVATAR, EXPAND_REFERRAL, EXPAND_COURSE
+)
+
+
+def build_url(base_url:str, path:str, **params) -> str:
+    '''
+    Returns the URL of the endpoint with a properly
+    encoded query. Parameters that are `None` are left
+    out, and commas are kept as they are.
+    '''
+    query = urlencode({i: j for i, j in params.items() if j is not None}, safe=',')
+    return f'{base_url}{path}?{query}' if query else f'{base_url}{path}'
+
+
+def expand_param(expand, default:tuple) -> str | None:
+    '''
+    Returns the `expand` query parameter for the chosen
+    expansions, all of which have to be among `default`.
+    `None` chooses all of them, an empty list none.
+    '''
+    if expand is None:
+        expand = default
+    elif isinstance(expand, str):
+        raise TypeError('\'expand\' should be a list of EXPAND_* constants')
+    for i in expand:
+        if i not in default:
+            raise ValueError(f'Can\'t expand {i!r} here, only {", ".join(default)}')
+    return ','.join(expand) if len(expand) > 0 else None
+
+
+def types_param(types) -> str:
+    '''
+    Returns the `type` query parameter for the chosen
+    project types, `None` choosing all of them.
+    '''
+    if types is None:
+        types = PROJECT_TYPES
+    elif isinstance(types, str):
+        raise TypeError('\'types\' should be a list of TYPE_* constants')
+    for i in types:
+        if i not in PROJECT_TYPES:
+            raise ValueError(f'Unknown project type: {i!r}')
+    if len(types) == 0:
+        raise ValueError('At least one project type is needed')
+    return ','.join(types)
@@ -0,0 +1,314 @@
+import bisect
+import datetime
+import heapq
+import json
+import os
+import re
+import struct
+import threading
+from array import array
+from .classes import *
+from .classes import _parse_datetime
+from .datatypes import *
+
+_MAGIC = b'ALGOIDX2'
+_HEADER = struct.Struct('<I')
+_WORD = re.compile(r'\w+')
+
+_PROJECT = 0
+_COMMENT = 1
+
+
+def _words(text:str) -> set:
+    return set(_WORD.findall(text.lower())) if text else set()
+
+
+def _contains(postings:array, position:int) -> bool:
+    i = bisect.bisect_left(postings, position)
+    return i < len(postings) and postings[i] == position
+
+
+def _timestamp(value) -> int:
+    if isinstance(value, str):
+        value = _parse_datetime(value)
+    return int(value.timestamp())
+
+
+def _project(item) -> tuple:
+    if isinstance(item, Project):
+        reactions = item.reactions
+        return (
+            item.id, f'{item.title} {item.description or ""}', item.type,
+            item.author.id, _timestamp(item.created_at), item.likes, item.views,
+            reactions.likes + reactions.loves + reactions.fires
+        )
+    return (
+        item['id'], f'{item["title"]} {item["description"] or ""}', item['type'],
+        item['author']['id'], _timestamp(item['createdAt']), item['likesCount'],
+        item['viewsCount'], sum(
+            item['reactions']['counters'].get(i, 0)
+            for i in (REACTION_LIKE, REACTION_LOVE, REACTION_FIRE)
+        )
+    )
+
+
+def _comments(items) -> list:
+    # walking replies with a stack instead of recursion
+    stack = [i.dict if isinstance(i, Comment) else i for i in reversed(list(items))]
+    result = []
+    while stack:
+        item = stack.pop()
+        result.append((
+            item['id'], item['message'], None, item['author']['id'],
+            _timestamp(item['createdAt']), 0, 0, 0
+        ))
+        stack.extend(reversed(item['children']))
+    return result
+
+
+class SearchIndex:
+    def __init__(self):
+        '''
+        In-memory inverted index over project titles and
+        descriptions and comment messages.
+
+        Objects are added with `add_projects()` and
+        `add_comments()`. Adding an object with the same ID
+        again replaces the old one, and the replaced rows are
+        dropped once they make up half of the index.
+        '''
+        self._postings =  {}                # word: array of positions
+        self._ids =       array('q')
+        self._kinds =     array('b')
+        self._types =     array('b')        # index in _type_names, -1 for comments
+        self._authors =   array('q')
+        self._created =   array('q')
+        self._likes =     array('q')
+        self._views =     array('q')
+        self._reactions = array('q')
+        self._alive =     bytearray()
+        self._type_names = []
+        self._positions = ({}, {})          # per kind, id: position
+        self._lock =      threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions[_PROJECT]) + len(self._positions[_COMMENT])
+
+    def _add(self, kind:int, rows:list):
+        with self._lock:
+            for id, text, type, author, created, likes, views, reactions in rows:
+                old = self._positions[kind].get(id)
+                if old is not None:
+                    self._alive[old] = 0
+
+                position = len(self._ids)
+                self._positions[kind][id] = position
+                if type is None:
+                    type = -1
+                else:
+                    if type not in self._type_names:
+                        self._type_names.append(type)
+                    type = self._type_names.index(type)
+
+                self._ids.append(id)
+                self._kinds.append(kind)
+                self._types.append(type)
+                self._authors.append(author)
+                self._created.append(created)
+                self._likes.append(likes)
+                self._views.append(views)
+                self._reactions.append(reactions)
+                self._alive.append(1)
+
+                for word in _words(text):
+                    postings = self._postings.get(word)
+                    if postings is None:
+                        postings = self._postings[word] = array('l')
+                    postings.append(position)
+
+            if len(self._ids) > 2 * len(self):
+                self._compact()
+
+    def _compact(self):
+        # positions only move down, so postings stay sorted
+        alive = self._alive
+        moved = array('l', [-1]) * len(alive)
+        position = 0
+        for i in range(len(alive)):
+            if alive[i]:
+                moved[i] = position
+                position += 1
+        if position == len(alive):
+            return
+
+        for name in ('_ids', '_kinds', '_types', '_authors', '_created', '_likes', '_views', '_reactions'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [j for i, j in enumerate(column) if alive[i]]))
+        self._alive = bytearray(b'\x01') * position
+
+        for word, postings in list(self._postings.items()):
+            postings = array('l', [moved[i] for i in postings if alive[i]])
+            if len(postings) == 0:
+                del self._postings[word]
+            else:
+                self._postings[word] = postings
+
+        for positions in self._positions:
+            for id, i in positions.items():
+                positions[id] = moved[i]
+
+    def compact(self):
+        '''
+        Drops rows of replaced objects and their postings.
+        `save()` does it before writing the index.
+        '''
+        with self._lock:
+            self._compact()
+
+    def add_projects(self, projects):
+        '''
+        Indexes projects (`Project`-s or their dicts).
+        '''
+        self._add(_PROJECT, [_project(i) for i in projects])
+
+    def add_comments(self, comments):
+        '''
+        Indexes comments (`Comment`-s or their dicts)
+        along with their replies.
+        '''
+        self._add(_COMMENT, _comments(comments))
+
+    def _key(self, rank:str):
+        # columns are replaced by compaction, so this is
+        # only called while holding the lock
+        if rank is None:
+            return self._created.__getitem__
+        scores = {
+            RANK_LIKES: self._likes, RANK_VIEWS: self._views,
+            RANK_REACTIONS: self._reactions
+        }[rank]
+        created = self._created
+        return lambda i: (scores[i], created[i])
+
+    def _search(self, kind:int, query:str, type:str, author_id:int,
+                since:datetime.datetime, until:datetime.datetime, rank:str, limit:int) -> list:
+        words = _words(query)
+        if len(words) == 0:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(i) for i in words]
+            if None in postings:
+                return []
+            # intersecting from the rarest word, postings are sorted
+            postings.sort(key=len)
+            candidates = postings[0]
+            for i in postings[1:]:
+                if len(i) > len(candidates)*16:
+                    candidates = [j for j in candidates if _contains(i, j)]
+                else:
+                    candidates = set(candidates).intersection(i)
+                if len(candidates) == 0:
+                    return []
+
+            if type is not None:
+                if type not in self._type_names:
+                    return []
+                type = self._type_names.index(type)
+            since = None if since is None else _timestamp(since)
+            until = None if until is None else _timestamp(until)
+
+            found = [
+                i for i in candidates
+                if self._alive[i] and self._kinds[i] == kind
+                and (type is None or self._types[i] == type)
+                and (author_id is None or self._authors[i] == author_id)
+                and (since is None or self._created[i] >= since)
+                and (until is None or self._created[i] < until)
+            ]
+            return [self._ids[i] for i in heapq.nlargest(limit, found, key=self._key(rank))]
+
+    def search_projects(self, query:str, type:str=None, author_id:int=None,
+                        since:datetime.datetime=None, until:datetime.datetime=None,
+                        rank:str=RANK_LIKES, limit:int=20) -> list:
+        '''
+        Returns IDs of up to `limit` projects that have all
+        words of `query` in their title or description,
+        the best ones by `rank` first.
+
+        `since` and `until` filter projects by creation date.
+        '''
+        if rank not in (RANK_LIKES, RANK_VIEWS, RANK_REACTIONS):
+            raise ValueError(f'Unknown rank: {rank}')
+        return self._search(_PROJECT, query, type, author_id, since, until, rank, limit)
+
+    def search_comments(self, query:str, author_id:int=None, since:datetime.datetime=None,
+                        until:datetime.datetime=None, limit:int=20) -> list:
+        '''
+        Returns IDs of up to `limit` comments that have all
+        words of `query` in their message, newest first.
+        '''
+        # newest first
+        return self._search(_COMMENT, query, None, author_id, since, until, None, limit)
+
+    def save(self, path:str):
+        '''
+        Saves the index into a file.
+        '''
+        with self._lock:
+            self._compact()
+            columns = [
+                self._ids, self._kinds, self._types, self._authors, self._created,
+                self._likes, self._views, self._reactions
+            ]
+            words = list(self._postings)
+            lengths = array('q', [len(self._postings[i]) for i in words])
+            parts = [i.tobytes() for i in columns] + [bytes(self._alive), lengths.tobytes()]\
+                  + [self._postings[i].tobytes() for i in words]
+            header = json.dumps({
+                'types': self._type_names, 'words': words,
+                'sizes': [len(i) for i in parts[:len(columns)+2]]
+            }, ensure_ascii=False).encode()
+
+            temp = path+'.tmp'
+            with open(temp, 'wb') as f:
+                f.write(_MAGIC)
+                f.write(_HEADER.pack(len(header)))
+                f.write(header)
+                for i in parts:
+                    f.write(i)
+            os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path:str):
+        '''
+        Loads an index saved with `save()`.
+        '''
+        index = cls()
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f'{path} is not a search index')
+            header = json.loads(f.read(_HEADER.unpack(f.read(_HEADER.size))[0]))
+            columns = [
+                index._ids, index._kinds, index._types, index._authors, index._created,
+                index._likes, index._views, index._reactions
+            ]
+            for column, size in zip(columns, header['sizes']):
+                column.frombytes(f.read(size))
+            index._alive = bytearray(f.read(header['sizes'][len(columns)]))
+            lengths = array('q')
+            lengths.frombytes(f.read(header['sizes'][len(columns)+1]))
+
+            postings = array('l')
+            postings.frombytes(f.read())
+
+        start = 0
+        for word, length in zip(header['words'], lengths):
+            index._postings[word] = postings[start:start+length]
+            start += length
+
+        index._type_names = header['types']
+        for position, (id, kind, alive) in enumerate(zip(index._ids, index._kinds, index._alive)):
+            if alive:
+                index._positions[kind][id] = position
+        return index
@@ -0,0 +1,320 @@
+import mmap
+import os
+import struct
+from .classes import *
+from .decode import loads, dumps
+
+# snapshot layout:
+#   data file:  MAGIC, then records of RECORD header + JSON payload
+#   index file: INDEX_MAGIC, covered data length, then ENTRY-s sorted by (kind, id)
+_MAGIC = b'ALGOSNP1'
+_INDEX_MAGIC = b'ALGOIDX1'
+_RECORD = struct.Struct('<BqI')     # kind, id, payload length
+_ENTRY = struct.Struct('<BqQ')      # kind, id, record offset
+_LENGTH = struct.Struct('<Q')
+_INDEX_HEADER = len(_INDEX_MAGIC) + _LENGTH.size
+
+_PROJECT = 1
+_PROFILE = 2
+_COMMENT = 3
+
+
+def _payload(item) -> dict:
+    if isinstance(item, Model):
+        if item.dict is None:
+            raise ValueError('Objects created with keep_dict=False can\'t be saved')
+        return item.dict
+    return item
+
+
+def _scan(data) -> tuple:
+    '''
+    Reads record headers of the data file and returns
+    `(entries, end)`, where `end` is the end of the last
+    complete record.
+    '''
+    entries = []
+    offset = len(_MAGIC)
+    while offset + _RECORD.size <= len(data):
+        kind, id, length = _RECORD.unpack_from(data, offset)
+        if offset + _RECORD.size + length > len(data):
+            break
+        entries.append((kind, id, offset))
+        offset += _RECORD.size + length
+    return entries, offset
+
+
+def _index(entries:list) -> list:
+    # the latest record with the same id wins
+    latest = {(kind, id): offset for kind, id, offset in entries}
+    return sorted((kind, id, offset) for (kind, id), offset in latest.items())
+
+
+def _read_index(path:str, length:int):
+    '''
+    Returns the contents of the index file or `None` if
+    it doesn't exist or doesn't cover the data file.
+    '''
+    try:
+        with open(path, 'rb') as f:
+            index = f.read()
+    except FileNotFoundError:
+        return None
+    if index[:len(_INDEX_MAGIC)] != _INDEX_MAGIC\
+    or _LENGTH.unpack_from(index, len(_INDEX_MAGIC))[0] != length:
+        return None
+    return index
+
+
+class SnapshotWriter:
+    def __init__(self, path:str):
+        '''
+        Appends raw API responses to a snapshot file
+        at `path`. The index is kept next to it in
+        `path + '.idx'` and is written on `flush()`
+        and `close()`.
+
+        If the snapshot already exists, new records
+        are added to it. Records with the same ID as
+        older ones replace them.
+        '''
+        self.path: str = path
+        self.index_path: str = path+'.idx'
+
+        length = os.path.getsize(path) if os.path.exists(path) else 0
+        self._file = open(path, 'r+b' if length > 0 else 'w+b')
+        if length == 0:
+            self._file.write(_MAGIC)
+            self._entries = []
+        else:
+            if self._file.read(len(_MAGIC)) != _MAGIC:
+                self._file.close()
+                raise ValueError(f'{path} is not a snapshot')
+
+            index = _read_index(self.index_path, length)
+            if index is not None:
+                self._entries = list(_ENTRY.iter_unpack(memoryview(index)[_INDEX_HEADER:]))
+            else:
+                with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    self._entries, end = _scan(data)
+                # dropping a record that was cut off midway
+                self._file.truncate(end)
+            self._file.seek(0, os.SEEK_END)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _add(self, kind:int, item):
+        data = _payload(item)
+        payload = dumps(data)
+        offset = self._file.tell()
+        self._file.write(_RECORD.pack(kind, data['id'], len(payload)))
+        self._file.write(payload)
+        self._entries.append((kind, data['id'], offset))
+
+    def add_project(self, project):
+        '''
+        Saves a project (a `Project` or its `dict`).
+        '''
+        self._add(_PROJECT, project)
+
+    def add_projects(self, projects):
+        '''
+        Saves all passed projects.
+        '''
+        for i in projects:
+            self._add(_PROJECT, i)
+
+    def add_profile(self, profile):
+        '''
+        Saves a profile (a `Profile` or its `dict`).
+        '''
+        self._add(_PROFILE, profile)
+
+    def add_comments(self, comments):
+        '''
+        Saves all passed comments (`Comment`-s or their
+        `dict`-s), along with their replies.
+        '''
+        for i in comments:
+            self._add(_COMMENT, i)
+
+    def flush(self):
+        '''
+        Writes pending records and the index to disk.
+        '''
+        self._file.flush()
+        length = self._file.tell()
+        self._entries = _index(self._entries)
+
+        temp = self.index_path+'.tmp'
+        with open(temp, 'wb') as f:
+            f.write(_INDEX_MAGIC)
+            f.write(_LENGTH.pack(length))
+            for i in self._entries:
+                f.write(_ENTRY.pack(*i))
+        os.replace(temp, self.index_path)
+
+    def close(self):
+        '''
+        Writes the index and closes the snapshot.
+        '''
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+class SnapshotReader:
+    def __init__(self, path:str, lazy:bool=False, keep_dict:bool=True, identity_map:IdentityMap=None):
+        '''
+        Reads a snapshot created by `SnapshotWriter`.
+
+        Both files are memory-mapped, so opening even a
+        huge snapshot is instant and only the records
+        that are accessed are read from disk.
+
+        If the index is missing or outdated, it is
+        rebuilt from the data file.
+
+        `lazy`, `keep_dict` and `identity_map` are used
+        for the objects built from the records like in
+        `Session`.
+        '''
+        if lazy and not keep_dict:
+            raise ValueError('Lazy objects have to keep their dict')
+
+        self.path: str =       path
+        self.lazy: bool =      lazy
+        self.keep_dict: bool = keep_dict
+        self.identity_map =    identity_map
+
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(_MAGIC)] != _MAGIC:
+            self._data.close()
+            raise ValueError(f'{path} is not a snapshot')
+
+        self._index = None
+        try:
+            with open(path+'.idx', 'rb') as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if index[:len(_INDEX_MAGIC)] == _INDEX_MAGIC\
+            and _LENGTH.unpack_from(index, len(_INDEX_MAGIC))[0] == len(self._data):
+                self._index = index
+            else:
+                index.close()
+        except (FileNotFoundError, ValueError):
+            pass
+
+        if self._index is None:
+            entries = _index(_scan(self._data)[0])
+            self._index = b''.join([
+                _INDEX_MAGIC, _LENGTH.pack(len(self._data)),
+                *[_ENTRY.pack(*i) for i in entries]
+            ])
+        self._count = (len(self._index)-_INDEX_HEADER) // _ENTRY.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, position:int) -> tuple:
+        return _ENTRY.unpack_from(self._index, _INDEX_HEADER + position*_ENTRY.size)
+
+    def _lower(self, kind:int, id:int) -> int:
+        # binary search over the sorted index
+        low, high = 0, self._count
+        while low < high:
+            middle = (low+high) // 2
+            if self._entry(middle)[:2] < (kind, id):
+                low = middle+1
+            else:
+                high = middle
+        return low
+
+    def _find(self, kind:int, id:int):
+        position = self._lower(kind, id)
+        if position < self._count:
+            entry = self._entry(position)
+            if entry[:2] == (kind, id):
+                return entry[2]
+        return None
+
+    def _read(self, offset:int) -> dict:
+        _, _, length = _RECORD.unpack_from(self._data, offset)
+        start = offset + _RECORD.size
+        return loads(self._data[start:start+length])
+
+    def _get(self, kind:int, id:int, cls):
+        if type(id) != int:
+            raise TypeError(f'\'id\' should be int')
+        offset = self._find(kind, id)
+        if offset is None:
+            raise KeyError(id)
+        return cls(self._read(offset), self.lazy, self.keep_dict, self.identity_map)
+
+    def _all(self, kind:int, cls):
+        for position in range(self._lower(kind, -2**63), self._count):
+            entry_kind, _, offset = self._entry(position)
+            if entry_kind != kind:
+                return
+            yield cls(self._read(offset), self.lazy, self.keep_dict, self.identity_map)
+
+    def project(self, id:int) -> Project:
+        '''
+        Returns the saved project with the passed ID.
+
+        If there is no such project, raises `KeyError`.
+        '''
+        return self._get(_PROJECT, id, Project)
+
+    def profile(self, id:int) -> Profile:
+        '''
+        Returns the saved profile with the passed ID.
+
+        If there is no such profile, raises `KeyError`.
+        '''
+        return self._get(_PROFILE, id, Profile)
+
+    def comment(self, id:int) -> Comment:
+        '''
+        Returns the saved comment with the passed ID.
+
+        If there is no such comment, raises `KeyError`.
+        '''
+        return self._get(_COMMENT, id, Comment)
+
+    def projects(self):
+        '''
+        Yields all saved projects sorted by ID.
+        '''
+        return self._all(_PROJECT, Project)
+
+    def profiles(self):
+        '''
+        Yields all saved profiles sorted by ID.
+        '''
+        return self._all(_PROFILE, Profile)
+
+    def comments(self):
+        '''
+        Yields all saved comments sorted by ID.
+        '''
+        return self._all(_COMMENT, Comment)
+
+    def close(self):
+        '''
+        Closes the snapshot.
+        '''
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        self._data.close()
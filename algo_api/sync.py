@@ -0,0 +1,201 @@
+import sqlite3
+import threading
+import time
+from .api import *
+from .api import _map_many
+from .classes import *
+from .datatypes import *
+
+class SyncStore:
+    def __init__(self, path:str):
+        '''
+        Stores the last synced state of every project
+        in an SQLite database.
+        '''
+        self.path: str = path
+        self._lock =     threading.Lock()
+        self._db =       sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS projects ('
+            'id INTEGER PRIMARY KEY, student_id INTEGER, updated_at TEXT, '
+            'likes INTEGER, views INTEGER, comments INTEGER, remixes INTEGER, synced REAL)'
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS projects_student_id ON projects (student_id)'
+        )
+        self._db.commit()
+
+    def get(self, student_id:int) -> dict:
+        '''
+        Returns `{id: (updated_at, likes, views, comments, remixes)}`
+        of all stored projects of the user.
+        '''
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT id, updated_at, likes, views, comments, remixes '
+                'FROM projects WHERE student_id = ?', (student_id,)
+            ).fetchall()
+        return {i[0]: i[1:] for i in rows}
+
+    def save(self, student_id:int, projects:list):
+        '''
+        Stores the state of the passed projects of the user.
+        '''
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(i.id, student_id, *_state(i), now) for i in projects]
+            )
+            self._db.commit()
+
+    def remove(self, ids:list):
+        '''
+        Forgets the projects with the passed IDs.
+        '''
+        with self._lock:
+            self._db.executemany('DELETE FROM projects WHERE id = ?', [(i,) for i in ids])
+            self._db.commit()
+
+    def close(self):
+        '''
+        Closes the database.
+        '''
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM projects').fetchone()[0]
+
+
+def _state(project:Project) -> tuple:
+    return (
+        project.updated_at.isoformat(), project.likes,
+        project.views, project.comments, project.remixes
+    )
+
+
+class SyncResult:
+    __slots__ = (
+        'student_id', 'new', 'changed', 'counters', 'removed',
+        'errors', 'pages'
+    )
+
+    def __init__(self, student_id:int):
+        '''
+        What changed in the projects of a user since
+        the last sync.
+        '''
+        self.student_id: int = student_id
+        self.new: list =       []
+        self.changed: list =   []
+        self.counters: list =  []
+        self.removed: list =   []
+        self.errors: dict =    {}
+        self.pages: int =      0
+
+
+class Syncer:
+    def __init__(self, session:Session, store:SyncStore, on_change=None,
+                 per_page:int=50, workers:int=8, sources:bool=True):
+        '''
+        Mirrors projects of users, only fetching what
+        changed since the last run.
+
+        `on_change(project, code)` is called for every new
+        project and every project whose `updated_at`
+        changed. `code` is the source code of python
+        projects if `sources` is `True`, otherwise `None`.
+        '''
+        if type(per_page) != int:
+            raise TypeError(f'\'per_page\' should be int')
+        if type(workers) != int:
+            raise TypeError(f'\'workers\' should be int')
+
+        self.session: Session =  session
+        self.store: SyncStore =  store
+        self.on_change =         on_change
+        self.per_page: int =     per_page
+        self.workers: int =      workers
+        self.sources: bool =     sources
+
+    def sync(self, student_id:int, full:bool=False) -> SyncResult:
+        '''
+        Syncs projects of the user with the passed ID.
+
+        Projects are walked from the newest one, and the
+        walk stops at the first page that has nothing new
+        or changed. Pass `full=True` to walk all pages,
+        which also catches edits of old projects and
+        detects deleted ones.
+        '''
+        if type(student_id) != int:
+            raise TypeError(f'\'student_id\' should be int')
+
+        result = SyncResult(student_id)
+        known = self.store.get(student_id)
+        seen = set()
+        updated = []
+        counters = []
+        page = 1
+
+        while True:
+            items = self.session.get_projects(student_id, page, self.per_page, SORT_LATEST)
+            result.pages += 1
+            fresh = False
+
+            for i in items:
+                seen.add(i.id)
+                old = known.get(i.id)
+                state = _state(i)
+                if old is None:
+                    result.new.append(i.id)
+                    updated.append(i)
+                    fresh = True
+                elif old[0] != state[0]:
+                    result.changed.append(i.id)
+                    updated.append(i)
+                    fresh = True
+                elif old != state:
+                    result.counters.append(i.id)
+                    counters.append(i)
+
+            if len(items) < self.per_page or not (fresh or full):
+                break
+            page += 1
+
+        self.store.save(student_id, counters)
+        self._fetch(student_id, updated, result)
+
+        if full:
+            result.removed = [i for i in known if i not in seen]
+            self.store.remove(result.removed)
+        return result
+
+    def sync_many(self, student_ids, full:bool=False):
+        '''
+        Syncs projects of all users with the passed IDs
+        one after another and yields `(id, result)` tuples.
+        '''
+        for id in student_ids:
+            yield id, self.sync(id, full)
+
+    def _fetch(self, student_id:int, projects:list, result:SyncResult):
+        codes = {}
+        python = [i.id for i in projects if i.type == TYPE_PYTHON]
+        if self.sources and len(python) > 0:
+            self.session.transport.ensure_pool(self.workers)
+            codes = dict(_map_many(self.session.get_source_code, python, self.workers, False))
+
+        done = []
+        for i in projects:
+            code = codes.get(i.id)
+            if isinstance(code, Exception):
+                # not saving the state so it is retried next time
+                result.errors[i.id] = code
+                continue
+            if self.on_change is not None:
+                self.on_change(i, code)
+            done.append(i)
+
+        self.store.save(student_id, done)
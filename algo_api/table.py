@@ -0,0 +1,206 @@
+from .classes import _parse_datetime
+from .datatypes import *
+
+# optional libraries for building tables
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import pandas
+except ImportError:
+    pandas = None
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# numpy types of the columns, timestamps are seconds since the epoch in UTC
+PROJECT_COLUMNS = {
+    'id':             'int64',
+    'type':           'U12',
+    'author_id':      'int64',
+    'likes':          'int64',
+    'views':          'int64',
+    'remixes':        'int64',
+    'comments':       'int64',
+    'reaction_likes': 'int64',
+    'reaction_loves': 'int64',
+    'reaction_fires': 'int64',
+    'is_deleted':     'bool',
+    'created_at':     'datetime64[s]',
+    'updated_at':     'datetime64[s]',
+}
+
+PROFILE_COLUMNS = {
+    'id':           'int64',
+    'is_celebrity': 'bool',
+    'classmates':   'int64',
+    'projects':     'int64',
+    'views':        'int64',
+    'likes':        'int64',
+    'reactions':    'int64',
+    'friends':      'int64',
+    'followers':    'int64',
+    'following':    'int64',
+    'updated_at':   'datetime64[s]',
+}
+
+
+def _timestamp(value:str | None) -> int | None:
+    return None if value is None else int(_parse_datetime(value).timestamp())
+
+
+def _require(module, name:str):
+    if module is None:
+        raise ImportError(f'{name} is needed for this, install it with `pip install {name}`')
+
+
+def project_columns(items:list) -> dict:
+    '''
+    Turns raw project payloads (for example, from
+    `get_projects(raw=True)`) into a dict of columns
+    without creating `Project` objects.
+
+    Timestamps are seconds since the epoch in UTC,
+    missing ones are `None`.
+    '''
+    columns = {i: [] for i in PROJECT_COLUMNS}
+    id, type, author_id, likes, views, remixes, comments, reaction_likes,\
+    reaction_loves, reaction_fires, is_deleted, created_at, updated_at = columns.values()
+
+    for i in items:
+        counters = i['reactions']['counters']
+        id.append(i['id'])
+        type.append(i['type'])
+        author_id.append(i['author']['id'])
+        likes.append(i['likesCount'])
+        views.append(i['viewsCount'])
+        remixes.append(i['remixesCount'])
+        comments.append(i['commentsCount'])
+        reaction_likes.append(counters.get(REACTION_LIKE, 0))
+        reaction_loves.append(counters.get(REACTION_LOVE, 0))
+        reaction_fires.append(counters.get(REACTION_FIRE, 0))
+        is_deleted.append(i['isDeleted'] != 0)
+        created_at.append(_timestamp(i.get('createdAt')))
+        updated_at.append(_timestamp(i.get('updatedAt')))
+
+    return columns
+
+
+def profile_columns(items:list) -> dict:
+    '''
+    Turns raw profile payloads into a dict of columns
+    without creating `Profile` objects.
+
+    Stats of profiles fetched without them and missing
+    timestamps are `None`.
+    '''
+    columns = {i: [] for i in PROFILE_COLUMNS}
+    id, is_celebrity, classmates, projects, views, likes, reactions,\
+    friends, followers, following, updated_at = columns.values()
+
+    for i in items:
+        stats = i.get('stats') or {}
+        id.append(i['id'])
+        is_celebrity.append(bool(i['isCelebrity']))
+        classmates.append(stats.get('totalClassmates'))
+        projects.append(stats.get('totalProjectCount'))
+        views.append(stats.get('totalProjectViews'))
+        likes.append(stats.get('totalProjectLikes'))
+        reactions.append(stats.get('totalReactions'))
+        friends.append(stats.get('totalFriends'))
+        followers.append(stats.get('totalFollowers'))
+        following.append(stats.get('totalFollowing'))
+        updated_at.append(_timestamp(i.get('updatedAt')))
+
+    return columns
+
+
+def _types(columns:dict) -> dict:
+    types = PROJECT_COLUMNS if list(columns) == list(PROJECT_COLUMNS) else PROFILE_COLUMNS
+    if list(columns) != list(types):
+        raise ValueError('Columns should come from project_columns() or profile_columns()')
+    return types
+
+
+def _numpy_type(type:str, values:list) -> str:
+    # integer columns with missing values become floats with NaN, like in pandas
+    return 'float64' if type == 'int64' and None in values else type
+
+
+def to_numpy(columns:dict):
+    '''
+    Converts columns into a NumPy structured array.
+    Missing timestamps are `NaT` and missing numbers
+    are `NaN`, which makes their column `float64`.
+    '''
+    _require(numpy, 'numpy')
+    types = _types(columns)
+    array = numpy.empty(len(columns['id']), dtype=[
+        (name, _numpy_type(types[name], values)) for name, values in columns.items()
+    ])
+    for name, values in columns.items():
+        missing = None in values
+        if types[name].startswith('datetime64'):
+            if missing:
+                array[name] = [
+                    numpy.datetime64('NaT') if i is None else numpy.datetime64(i, 's') for i in values
+                ]
+            else:
+                array[name] = numpy.array(values, dtype='int64').astype(types[name])
+        elif missing:
+            array[name] = [numpy.nan if i is None else i for i in values]
+        else:
+            array[name] = values
+    return array
+
+
+def to_pandas(columns:dict):
+    '''
+    Converts columns into a pandas `DataFrame` with
+    timestamps in UTC. Missing values are `NaT` or `NaN`.
+    '''
+    _require(pandas, 'pandas')
+    types = _types(columns)
+    return pandas.DataFrame({
+        name: pandas.to_datetime(values, unit='s', utc=True)
+        if types[name].startswith('datetime64') else values
+        for name, values in columns.items()
+    })
+
+
+def to_arrow(columns:dict):
+    '''
+    Converts columns into a PyArrow `Table` with
+    timestamps in UTC. Missing values are nulls.
+    '''
+    _require(pyarrow, 'pyarrow')
+    types = _types(columns)
+    return pyarrow.table({
+        name: pyarrow.array(values, pyarrow.timestamp('s', tz='UTC'))
+        if types[name].startswith('datetime64') else values
+        for name, values in columns.items()
+    })
+
+
+def write_parquet(columns:dict, path:str):
+    '''
+    Writes columns into a Parquet file. It can be
+    loaded back with `pyarrow.parquet.read_table()`
+    or `pandas.read_parquet()`.
+    '''
+    table = to_arrow(columns)
+    pyarrow.parquet.write_table(table, path)
+
+
+def write_feather(columns:dict, path:str):
+    '''
+    Writes columns into a Feather file. It can be
+    loaded back with `pyarrow.feather.read_table()`
+    or `pandas.read_feather()`.
+    '''
+    table = to_arrow(columns)
+    pyarrow.feather.write_feather(table, path)
@@ -0,0 +1,144 @@
+from array import array
+from .classes import *
+
+class CommentThread:
+    __slots__ = (
+        'ids', 'parents', 'depths', 'authors', 'ends', 'messages',
+        'items', '_positions', '_by_author', '_identity_map'
+    )
+
+    def __init__(self, items:list, keep_dict:bool=True, identity_map:IdentityMap=None):
+        '''
+        All comments under a project, flattened into arrays
+        in thread order: every comment is followed by its
+        replies, and the replies of a comment take up a
+        continuous range.
+
+        `items` are top-level comments as `Comment`-s or
+        raw dicts, their replies are taken from `children`.
+        Authors of comments returned by `comment()` are
+        shared through `identity_map` if it's passed.
+        '''
+        self.ids =      array('q')  # comment ID
+        self.parents =  array('l')  # position of the parent comment, -1 for top-level ones
+        self.depths =   array('l')  # 0 for top-level comments
+        self.authors =  array('q')  # author ID
+        self.messages = []
+        self.items =    [] if keep_dict else None
+
+        # walking the threads with a stack instead of recursion
+        stack = [(i.dict if isinstance(i, Comment) else i, -1, 0) for i in reversed(items)]
+        while stack:
+            item, parent, depth = stack.pop()
+            position = len(self.ids)
+            self.ids.append(item['id'])
+            self.parents.append(parent)
+            self.depths.append(depth)
+            self.authors.append(item['author']['id'])
+            self.messages.append(item['message'])
+            if keep_dict:
+                self.items.append(item)
+            for child in reversed(item['children']):
+                stack.append((child, position, depth+1))
+
+        # position after the last reply of every comment
+        sizes = array('l', [1]) * len(self.ids)
+        for position in range(len(self.ids)-1, -1, -1):
+            if self.parents[position] >= 0:
+                sizes[self.parents[position]] += sizes[position]
+        self.ends = array('l', [i+j for i, j in enumerate(sizes)])
+
+        self._positions = {id: i for i, id in enumerate(self.ids)}
+        self._by_author = None
+        self._identity_map = identity_map
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id:int) -> bool:
+        return id in self._positions
+
+    def position(self, id:int) -> int:
+        '''
+        Returns the position of the comment with the
+        passed ID. Raises `KeyError` if there is none.
+        '''
+        return self._positions[id]
+
+    def comment(self, id:int) -> Comment:
+        '''
+        Returns the comment with the passed ID as a
+        `Comment` object.
+        '''
+        if self.items is None:
+            raise ValueError('The thread was created with keep_dict=False')
+        return Comment(self.items[self._positions[id]], lazy=True, identity_map=self._identity_map)
+
+    def parent(self, id:int) -> int | None:
+        '''
+        Returns the ID of the comment the passed one
+        replies to, or `None` for top-level comments.
+        '''
+        parent = self.parents[self._positions[id]]
+        return None if parent < 0 else self.ids[parent]
+
+    def depth(self, id:int) -> int:
+        '''
+        Returns how deep the comment is in its thread,
+        0 for top-level comments.
+        '''
+        return self.depths[self._positions[id]]
+
+    def roots(self) -> list:
+        '''
+        Returns IDs of all top-level comments.
+        '''
+        return [self.ids[i] for i, parent in enumerate(self.parents) if parent < 0]
+
+    def replies(self, id:int) -> list:
+        '''
+        Returns IDs of direct replies to the comment.
+        '''
+        position = self._positions[id]
+        result = []
+        child = position+1
+        while child < self.ends[position]:
+            result.append(self.ids[child])
+            child = self.ends[child]
+        return result
+
+    def count_replies(self, id:int, recursive:bool=True) -> int:
+        '''
+        Returns the number of replies to the comment,
+        including replies to replies unless `recursive`
+        is `False`.
+        '''
+        if not recursive:
+            return len(self.replies(id))
+        position = self._positions[id]
+        return self.ends[position]-position-1
+
+    def by_author(self, author_id:int) -> list:
+        '''
+        Returns IDs of all comments by the user with the
+        passed ID in thread order.
+        '''
+        if self._by_author is None:
+            self._by_author = {}
+            for id, author in zip(self.ids, self.authors):
+                self._by_author.setdefault(author, []).append(id)
+        return list(self._by_author.get(author_id, []))
+
+    def walk(self, id:int=None):
+        '''
+        Yields `(id, depth)` tuples of all comments in
+        thread order, or only of the passed comment and
+        its replies.
+        '''
+        if id is None:
+            start, end = 0, len(self.ids)
+        else:
+            start = self._positions[id]
+            end = self.ends[start]
+        for position in range(start, end):
+            yield self.ids[position], self.depths[position]
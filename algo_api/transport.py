@@ -0,0 +1,154 @@
+import email.utils
+import socket
+import threading
+import time
+import requests
+from urllib3.connection import HTTPConnection
+
+class RateLimiter:
+    def __init__(self, rate:float, burst:int=1):
+        '''
+        Client-side token bucket that lets through `rate`
+        requests per second on average and up to `burst`
+        requests at once.
+
+        One limiter can be shared between threads and
+        between several sessions.
+        '''
+        if rate <= 0:
+            raise ValueError('\'rate\' should be positive')
+        if type(burst) != int or burst < 1:
+            raise ValueError('\'burst\' should be a positive int')
+
+        self.rate: float =  rate
+        self.burst: int =   burst
+        self._tokens =      float(burst)
+        self._updated =     time.monotonic()
+        self._paused_until = 0.0
+        self._lock =        threading.Lock()
+
+    def acquire(self):
+        '''
+        Blocks until a request is allowed to be sent.
+        '''
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now-self._updated)*self.rate)
+                self._updated = now
+
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until-now, (1-self._tokens)/self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds:float):
+        '''
+        Stops letting requests through for `seconds`,
+        e.g. after the server asked to slow down.
+        '''
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic()+seconds)
+
+
+class _Adapter(requests.adapters.HTTPAdapter):
+    def __init__(self, socket_options:list, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+class Transport:
+    def __init__(self, pool_connections:int=10, pool_maxsize:int=10, pool_block:bool=False,
+                 connect_timeout:float=10, read_timeout:float=60, keep_alive:bool=True,
+                 keep_alive_idle:int=60):
+        '''
+        Connection pool and socket settings used by sessions.
+
+        One transport can be shared by several logged-in
+        sessions, so they reuse the same open sockets while
+        keeping their own cookies.
+        '''
+        for name, value in (('pool_connections', pool_connections), ('pool_maxsize', pool_maxsize)):
+            if type(value) != int:
+                raise TypeError(f'\'{name}\' should be int')
+            if value < 1:
+                raise ValueError(f'\'{name}\' should be at least 1')
+
+        self.pool_connections: int =  pool_connections
+        self.pool_maxsize: int =      pool_maxsize
+        self.pool_block: bool =       pool_block
+        self.connect_timeout: float = connect_timeout
+        self.read_timeout: float =    read_timeout
+        self.keep_alive: bool =       keep_alive
+        self.keep_alive_idle: int =   keep_alive_idle
+        self._lock =                  threading.Lock()
+
+        # tcp keep-alive probes so idle pooled sockets aren't silently dropped
+        options = list(HTTPConnection.default_socket_options)
+        if keep_alive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keep_alive_idle))
+
+        self.adapter = _Adapter(
+            options,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+
+    @property
+    def timeout(self) -> tuple:
+        return (self.connect_timeout, self.read_timeout)
+
+    def mount(self, session:requests.Session):
+        '''
+        Makes the `requests` session send its requests
+        through this transport.
+        '''
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+    def ensure_pool(self, size:int):
+        '''
+        Makes sure each pool can hold at least `size`
+        connections so concurrent requests don't drop and
+        re-open sockets.
+        '''
+        with self._lock:
+            if size <= self.pool_maxsize:
+                return
+            self.pool_maxsize = size
+            old = self.adapter.poolmanager
+            self.adapter.init_poolmanager(self.pool_connections, size, block=self.pool_block)
+            old.clear()
+
+    def close(self):
+        '''
+        Closes all pooled connections.
+        '''
+        self.adapter.close()
+
+
+def retry_after(value:str) -> float | None:
+    '''
+    Parses the `Retry-After` header, which is either a
+    number of seconds or an HTTP date.
+    '''
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp()-time.time())
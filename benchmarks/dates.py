@@ -0,0 +1,55 @@
+'''
+Micro-benchmark for the timestamp parsing done while
+building `Project` objects.
+
+    python -m benchmarks.dates
+'''
+import datetime
+import timeit
+
+from algo_api.classes import Project, _parse_datetime
+from benchmarks.fixtures import projects_page
+
+
+def legacy_parse(value:str) -> datetime.datetime:
+    # the slicing parser every model class used before
+    date = [int(i) for i in value[0:19].split('T')[0].split('-')]
+    time = [int(i) for i in value[0:19].split('T')[1].split(':')]
+    return datetime.datetime(
+        year=date[0], month=date[1], day=date[2],
+        hour=time[0], minute=time[1], second=time[2]
+    )
+
+
+def main(per_page:int=50, number:int=200):
+    page = projects_page(per_page=per_page)
+    stamps = []
+    for i in page:
+        stamps += [i['createdAt'], i['updatedAt']]
+        stamps += [j[k] for j in i['uploads'] for k in ('createdAt', 'updatedAt')]
+
+    def run(parse):
+        for i in stamps:
+            parse(i)
+
+    def cold():
+        _parse_datetime.cache_clear()
+        run(_parse_datetime)
+
+    results = {
+        'legacy':             timeit.timeit(lambda: run(legacy_parse), number=number),
+        'fromisoformat':      timeit.timeit(lambda: run(_parse_datetime.__wrapped__), number=number),
+        'shared, cold cache': timeit.timeit(cold, number=number),
+        'shared, warm cache': timeit.timeit(lambda: run(_parse_datetime), number=number),
+    }
+
+    print(f'{len(stamps)} timestamps per page of {per_page} projects, {number} pages')
+    for name, seconds in results.items():
+        print(f'  {name:<20} {seconds/number*1e6:9.1f} us/page  x{results["legacy"]/seconds:.1f}')
+
+    seconds = timeit.timeit(lambda: [Project(i) for i in page], number=number)
+    print(f'  Project() for the page  {seconds/number*1e6:9.1f} us/page')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''
+Decoding benchmark for a single large page of projects.
+
+Compares decoding the whole body with the stdlib and
+with the selected fast backend against streaming the
+`items` array in chunks, reporting peak memory and time.
+Each project is dropped right after it is decoded, like
+a caller processing the page item by item would do.
+
+    python -m benchmarks.decoding [per_page]
+'''
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from algo_api.decode import JSON_BACKEND, iter_items, loads
+from benchmarks.fixtures import projects_page
+
+CHUNK_SIZE = 65536
+
+
+def whole(body:bytes, parse):
+    for i in parse(body)['data']['items']:
+        pass
+
+
+def streamed(body:bytes):
+    chunks = (body[i:i+CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+    for i in iter_items(chunks):
+        pass
+
+
+def measure(func, *args) -> tuple:
+    gc.collect()
+    start = time.perf_counter()
+    func(*args)
+    seconds = time.perf_counter() - start
+
+    # tracing slows everything down, so it is a separate run
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, seconds
+
+
+def main(per_page:int=5000):
+    body = json.dumps({'data': {'items': projects_page(1, per_page)}}).encode()
+    print(f'{per_page} projects, {len(body) / 2**20:.1f} MiB of JSON, backend: {JSON_BACKEND}')
+
+    cases = {
+        'json.loads, whole body':           (whole, body, json.loads),
+        f'{JSON_BACKEND}, whole body':      (whole, body, loads),
+        f'{JSON_BACKEND}, streamed items':  (streamed, body),
+    }
+    for name, (func, *args) in cases.items():
+        peak, seconds = measure(func, *args)
+        # the body itself is allocated before tracing starts
+        print(f'  {name:<30} peak {peak / 2**20:7.1f} MiB  {seconds * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,163 @@
+'''
+Synthetic API payloads shaped like the responses of
+learn.algoritmika.org, used by the benchmarks.
+'''
+import datetime
+import random
+
+TYPES = [
+    'design', 'gamedesign', 'images', 'presentation', 'python',
+    'scratch', 'unity', 'video', 'vscode', 'website'
+]
+EPOCH = datetime.datetime(2022, 9, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=3)))
+
+
+def timestamp(rng:random.Random) -> str:
+    return (EPOCH + datetime.timedelta(seconds=rng.randrange(60*60*24*600))).isoformat()
+
+
+def author(id:int) -> dict:
+    return {
+        'id': id,
+        'firstName': f'Имя{id}',
+        'lastName': f'Фамилия{id}',
+        'name': f'Имя{id} Фамилия{id}',
+        'isCelebrity': id % 100 == 0,
+        'avatar': {
+            'name': f'avatar_{id % 30}',
+            'smallUrl': f'https://learn.algoritmika.org/avatars/{id % 30}-small.png',
+            'svgUrl': f'https://learn.algoritmika.org/avatars/{id}.svg'
+        }
+    }
+
+
+def upload(id:int, rng:random.Random) -> dict:
+    created = timestamp(rng)
+    return {
+        'id': id,
+        'filename': f'file_{id}.png',
+        'filepath': f'/uploads/projects/{id}/file_{id}.png',
+        'createdAt': created,
+        'updatedAt': created
+    }
+
+
+def project(id:int, rng:random.Random=None, authors:int=5000) -> dict:
+    rng = rng or random.Random(id)
+    type = TYPES[id % len(TYPES)]
+    created = timestamp(rng)
+    return {
+        'id': id,
+        'title': f'Проект номер {id}',
+        'description': 'Описание проекта ' * rng.randrange(0, 5),
+        'type': type,
+        'sharingMode': ['group', 'universe'],
+        'likesCount': rng.randrange(500),
+        'viewsCount': rng.randrange(5000),
+        'remixesCount': rng.randrange(10),
+        'commentsCount': rng.randrange(30),
+        'isDeleted': 0,
+        'author': author(rng.randrange(authors)),
+        'previewImages': {
+            'name': 'auto',
+            'small': f'https://learn.algoritmika.org/previews/{id}-small.png',
+            'large': f'https://learn.algoritmika.org/previews/{id}.png'
+        },
+        'reactions': {
+            'my': ['like'] if rng.random() < 0.1 else [],
+            'counters': {'like': rng.randrange(100), 'love': rng.randrange(50), 'fire': rng.randrange(50)}
+        },
+        'remix': {
+            'isRemixEnabled': 1,
+            'originalProject': None if rng.random() < 0.9 else {
+                'id': id-1, 'title': f'Проект номер {id-1}', 'studentName': 'Имя Фамилия'
+            }
+        },
+        'uploads': [upload(id*10+i, rng) for i in range(rng.randrange(3))],
+        'meta': {'projectId': 100000+id} if type == 'python' else [],
+        'createdAt': created,
+        'updatedAt': timestamp(rng) if rng.random() < 0.5 else created
+    }
+
+
+def comment(id:int, rng:random.Random=None, depth:int=1, authors:int=5000) -> dict:
+    rng = rng or random.Random(id)
+    return {
+        'id': id,
+        'message': 'Классный проект! ' * rng.randrange(1, 4),
+        'author': author(rng.randrange(authors)),
+        'createdAt': timestamp(rng),
+        'children': [
+            comment(id*10+i, rng, depth-1, authors) for i in range(rng.randrange(3))
+        ] if depth > 0 else []
+    }
+
+
+def profile(id:int, rng:random.Random=None, friends:int=20, authors:int=5000) -> dict:
+    rng = rng or random.Random(id)
+    return {
+        'id': id,
+        'firstName': f'Имя{id}',
+        'lastName': f'Фамилия{id}',
+        'fullName': f'Имя{id} Фамилия{id}',
+        'isCelebrity': False,
+        'about': 'Обо мне',
+        'activeCourse': 'Python Start',
+        'city': 'Москва',
+        'friendStatus': None,
+        'stats': {
+            'totalClassmates': 10, 'totalProjectCount': 20, 'totalProjectViews': 300,
+            'totalProjectLikes': 40, 'totalReactions': 50, 'totalFriends': friends,
+            'totalFollowers': 5, 'totalFollowing': 6, 'totalAvatars': 2,
+            'totalAvatarItems': 8, 'totalLootboxes': 1
+        },
+        'avatars': {
+            'available': [
+                {'name': f'avatar_{i}', 'originalUrl': f'/avatars/{i}.png', 'smallUrl': f'/avatars/{i}-small.png'}
+                for i in range(3)
+            ],
+            'svgUrl': f'https://learn.algoritmika.org/avatars/{id}.svg'
+        },
+        'friends': [author(rng.randrange(authors)) for _ in range(friends)],
+        'classmates': [author(rng.randrange(authors)) for _ in range(friends // 2)],
+        'updatedAt': timestamp(rng)
+    }
+
+
+def projects_page(page:int=1, per_page:int=50) -> list:
+    start = (page-1) * per_page
+    return [project(i) for i in range(start+1, start+per_page+1)]
+
+
+def self_profile(id:int, rng:random.Random=None) -> dict:
+    rng = rng or random.Random(id)
+    return {
+        'studentId': id,
+        'firstName': f'Имя{id}',
+        'lastName': f'Фамилия{id}',
+        'parentName': 'Отчество',
+        'fullName': f'Имя{id} Фамилия{id}',
+        'username': f'student{id}',
+        'phone': '+70000000000',
+        'email': f'student{id}@example.com',
+        'isTeacher': False,
+        'isCelebrity': False,
+        'lang': 'ru',
+        'birthDate': '2010-01-01T00:00:00+03:00',
+        'branch': {
+            'id': 1, 'brandName': 'Алгоритмика', 'title': 'Москва', 'code': 'msk',
+            'phone': '+70000000000', 'siteUrl': 'https://algoritmika.org'
+        },
+        'ban': {'active': False, 'reason': None, 'expiresAt': None},
+        'settings': {
+            'platformUploadFileExtensions': 'png jpg gif mp3 wav',
+            'vscodeFileNamePattern': '*.py',
+            'prosveshenieToken': None
+        },
+        'avatar': author(id)['avatar'],
+        'course': {
+            'id': 1, 'name': 'python_start', 'displayName': 'Python Start', 'description': '',
+            'gamification': {'isEnabled': 1, 'regularLevelPoints': 100, 'bonusLevelPoints': 20}
+        },
+        'updatedAt': timestamp(rng)
+    }
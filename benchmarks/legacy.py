@@ -0,0 +1,93 @@
+'''
+The project model as it was before `__slots__` and lazy
+attributes, kept so that benchmarks can compare against
+it. Every object has a `__dict__` and everything is built
+eagerly.
+'''
+from algo_api.datatypes import *
+from benchmarks.dates import legacy_parse
+
+
+class Avatar:
+    def __init__(self, data):
+        self.name: str =      data['name']
+        self.small_url: str = data['smallUrl']
+        self.svg_url: str =   data['svgUrl']
+
+
+class ProfilePreview:
+    def __init__(self, data):
+        self.dict = data
+
+        self.id: int =            data['id']
+        self.first_name: str =    data['firstName']
+        self.last_name: str =     data['lastName']
+        self.full_name: str =     data['name']
+        self.is_celebrity: bool = data['isCelebrity']
+        self.avatar: Avatar =     Avatar(data['avatar'])
+        self.url: str =           f'https://learn.algoritmika.org/student-profile?profileId={self.id}'
+
+
+class PreviewImage:
+    def __init__(self, data):
+        self.name: str =      data['name']
+        self.small_url: str = data['small']
+        self.url: str       = data['large']
+
+
+class Reactions:
+    def __init__(self, data):
+        self.you_placed_like: bool = REACTION_LIKE in data['my']
+        self.you_placed_love: bool = REACTION_LOVE in data['my']
+        self.you_placed_fire: bool = REACTION_FIRE in data['my']
+        self.likes: int =            data['counters'].get(REACTION_LIKE, 0)
+        self.loves: int =            data['counters'].get(REACTION_LOVE, 0)
+        self.fires: int =            data['counters'].get(REACTION_FIRE, 0)
+
+
+class Upload:
+    def __init__(self, data):
+        self.id: int       = data['id']
+        self.filename: str = data['filename']
+        self.url: str      = 'https://learn.algoritmika.org'+data['filepath']
+        self.created_at =    legacy_parse(data['createdAt'])
+        self.updated_at =    legacy_parse(data['updatedAt'])
+
+
+class RemixedProject:
+    def __init__(self, data):
+        self.id: int =          data['id']
+        self.title: str =       data['title']
+        self.author_name: str = data['studentName']
+        self.url: str =         f'https://learn.algoritmika.org/community?projectId={self.id}'
+
+
+class Project:
+    def __init__(self, data):
+        self.dict = data
+
+        self.id: int =                          data['id']
+        self.title: str =                       data['title']
+        self.description: str =                 None if data['description'] == None\
+                                                or len(data['description']) == 0 else data['description']
+        self.type: str =                        data['type']
+        self.availability: str =                data['sharingMode']
+        if SHARING_MODE_PRIVATE in self.availability:
+            self.availability.remove(SHARING_MODE_PRIVATE)
+        self.likes: int =                       data['likesCount']
+        self.views: int =                       data['viewsCount']
+        self.remixes: int =                     data['remixesCount']
+        self.comments: int =                    data['commentsCount']
+        self.is_deleted: bool =                 data['isDeleted'] != 0
+        self.author: ProfilePreview =           ProfilePreview(data['author'])
+        self.image: PreviewImage =              None if data['previewImages']['large'] == None\
+                                                else PreviewImage(data['previewImages'])
+        self.reactions: Reactions =             Reactions(data['reactions'])
+        self.remix_enabled: bool =              data['remix']['isRemixEnabled'] != 0
+        self.original_project: RemixedProject = None if data['remix']['originalProject'] == None\
+                                                else RemixedProject(data['remix']['originalProject'])
+        self.uploads: list =                    [Upload(i) for i in data['uploads']]
+        self.url: str =                         f'https://learn.algoritmika.org/community?projectId={self.id}'
+        self.meta: dict =                       data['meta'] if type(data['meta']) == dict else {}
+        self.created_at =                       legacy_parse(data['createdAt'])
+        self.updated_at =                       legacy_parse(data['updatedAt'])
@@ -0,0 +1,67 @@
+'''
+Memory benchmark for holding a large crawl of projects.
+
+Every layout parses the same JSON pages and keeps the
+resulting objects alive, so raw payloads only count if
+the layout keeps them. The legacy layout is the model
+before `__slots__` and lazy attributes.
+
+    python -m benchmarks.memory [projects]
+'''
+import functools
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from algo_api.classes import Project, IdentityMap
+from benchmarks import legacy
+from benchmarks.fixtures import projects_page
+
+LAYOUTS = {
+    'raw dicts only':         lambda i: i,
+    'legacy Project (__dict__)': lambda i: legacy.Project(i),
+    'Project, keeps dict':    lambda i: Project(i),
+    'Project, lazy':          lambda i: Project(i, lazy=True),
+    'Project, keep_dict=False': lambda i: Project(i, keep_dict=False),
+}
+
+# layouts measured with authors shared through an IdentityMap
+SHARED = {
+    'Project, shared authors': lambda i, identity_map: Project(i, identity_map=identity_map),
+    'Project, keep_dict=False, shared authors':
+        lambda i, identity_map: Project(i, keep_dict=False, identity_map=identity_map),
+}
+
+
+def measure(pages:list, build, shared:bool=False) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    if shared:
+        build = functools.partial(build, identity_map=IdentityMap())
+    start = time.perf_counter()
+    items = [build(i) for page in pages for i in json.loads(page)['data']['items']]
+    seconds = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items, build
+    return size, seconds
+
+
+def main(count:int=100_000, per_page:int=100):
+    pages = [
+        json.dumps({'data': {'items': projects_page(page, per_page)}})
+        for page in range(1, count // per_page + 1)
+    ]
+    print(f'{count} projects, {sum(len(i) for i in pages) / 2**20:.0f} MiB of JSON')
+
+    layouts = [(name, build, False) for name, build in LAYOUTS.items()]
+    layouts += [(name, build, True) for name, build in SHARED.items()]
+    for name, build, shared in layouts:
+        size, seconds = measure(pages, build, shared)
+        print(f'  {name:<40} {size / 2**20:8.1f} MiB  {size / count:7.0f} B/project  {seconds:6.2f} s')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
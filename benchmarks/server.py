@@ -0,0 +1,302 @@
+'''
+A local stand-in for learn.algoritmika.org that serves
+the endpoints used by `Session` from the synthetic
+payloads in `benchmarks.fixtures`.
+
+    python -m benchmarks.server [port] [latency] [error rate]
+
+Point a session at it with `Session(base_url=server.url)`.
+'''
+import functools
+import gzip
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from benchmarks import fixtures
+
+
+class FakeServer:
+    def __init__(self, port:int=0, latency:float=0.0, jitter:float=0.0, error_rate:float=0.0,
+                 projects:int=1000, comments:int=200, etags:bool=True, compress:bool=True,
+                 seed:int=0):
+        '''
+        `latency` seconds (plus up to `jitter` more) are
+        waited before every response, and `error_rate` of
+        requests fail with a random 429, 500 or 503. Logging
+        in never fails, since POST requests aren't retried.
+
+        Every user has `projects` projects and every
+        project has `comments` top-level comments.
+
+        If `etags` is `True`, GET responses have an `ETag`
+        and conditional requests are answered with 304. If
+        `compress` is `True`, responses are gzipped for
+        clients that accept it.
+        '''
+        self.latency: float =    latency
+        self.jitter: float =     jitter
+        self.error_rate: float = error_rate
+        self.projects: int =     projects
+        self.comments: int =     comments
+        self.etags: bool =       etags
+        self.compress: bool =    compress
+        self.requests: int =     0
+        self.errors: int =       0
+        self.logins: int =       0
+        self._valid_from: int =  1     # older login tokens are answered with 401
+        self.codes: dict =       {}     # python project ID: code
+        self._random =           random.Random(seed)
+        self._lock =             threading.Lock()
+
+        server = self
+        class Handler(_Handler):
+            fake = server
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.requests += 1
+            return self.latency + self._random.random() * self.jitter
+
+    def expire(self):
+        '''
+        Logs every client out: requests with a token from
+        an earlier login are answered with 401 from now on.
+        '''
+        with self._lock:
+            self._valid_from = self.logins+1
+
+    def _login(self) -> int:
+        with self._lock:
+            self.logins += 1
+            return self.logins
+
+    def _expired(self, token:str | None) -> bool:
+        with self._lock:
+            return token is not None and int(token) < self._valid_from
+
+    def _fail(self) -> int | None:
+        with self._lock:
+            if self.error_rate <= 0 or self._random.random() >= self.error_rate:
+                return None
+            self.errors += 1
+            return self._random.choice((429, 500, 503))
+
+
+AUTH_PATH = '/s/auth/api/e/student/auth'
+
+
+# sub-objects that are only sent when asked for with `expand`
+PROJECT_EXPAND = ('uploads', 'remix')
+PROFILE_EXPAND = ('stats', 'avatars')
+SELF_PROFILE_EXPAND = ('branch', 'settings', 'avatar', 'course')
+
+
+def _expanded(data:dict, expand:str | None, keys:tuple) -> dict:
+    chosen = set(expand.split(',')) if expand else set()
+    for key in keys:
+        if key not in chosen:
+            data.pop(key, None)
+    return data
+
+
+# responses are generated once, so that the benchmarks
+# measure the client and not the fixtures
+@functools.lru_cache(maxsize=4096)
+def _projects(student_id:int, page:int, per_page:int, total:int, expand:str=None) -> bytes:
+    start = (page-1) * per_page
+    ids = range(start+1, min(total, start+per_page)+1)
+    return _dumps({'data': {'items': [
+        _expanded(fixtures.project(i if student_id is None else student_id*100000+i), expand, PROJECT_EXPAND)
+        for i in ids
+    ]}})
+
+
+@functools.lru_cache(maxsize=4096)
+def _comments(project_id:int, page:int, per_page:int, total:int) -> bytes:
+    start = (page-1) * per_page
+    ids = range(start+1, min(total, start+per_page)+1)
+    return _dumps({'data': {'items': [fixtures.comment(project_id*1000+i) for i in ids]}})
+
+
+@functools.lru_cache(maxsize=4096)
+def _profile(id:int, expand:str=None) -> bytes:
+    return _dumps({'data': _expanded(fixtures.profile(id), expand, PROFILE_EXPAND)})
+
+
+@functools.lru_cache(maxsize=4096)
+def _project(id:int, expand:str=None) -> bytes:
+    return _dumps({'data': _expanded(fixtures.project(id), expand, PROJECT_EXPAND)})
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode()
+
+
+@functools.lru_cache(maxsize=4096)
+def _gzip(body:bytes) -> bytes:
+    return gzip.compress(body, 6)
+
+
+def _etag(body:bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeServer = None
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body:bytes, status:int=200, headers:dict={}):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method:str):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length', 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+
+        time.sleep(self.fake._delay())
+        status = self.fake._fail() if url.path != AUTH_PATH else None
+        if status is not None:
+            return self._send(b'{"message": "injected error"}', status, {'Retry-After': '0'})
+        token = SimpleCookie(self.headers.get('Cookie', '')).get('token')
+        if url.path != AUTH_PATH and self.fake._expired(token and token.value):
+            return self._send(b'{"message": "unauthorized"}', 401)
+
+        try:
+            body = self._route(method, url.path, query, form)
+        except (KeyError, ValueError):
+            return self._send(b'{"message": "bad request"}', 400)
+        if body is None:
+            return self._send(b'{"message": "not found"}', 404)
+
+        headers = {}
+        if method == 'POST' and url.path == AUTH_PATH:
+            headers['Set-Cookie'] = f'token={self.fake._login()}; Path=/'
+        if method == 'GET' and self.fake.etags:
+            headers['ETag'] = _etag(body)
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                return self._send(b'', 304, headers)
+        if self.fake.compress and len(body) > 1024\
+        and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = _gzip(body)
+            headers['Content-Encoding'] = 'gzip'
+        self._send(body, 200, headers)
+
+    def _route(self, method:str, path:str, query:dict, form:dict) -> bytes | None:
+        fake = self.fake
+        parts = path.strip('/').split('/')
+
+        if method == 'POST' and path == AUTH_PATH:
+            if form.get('password') == 'wrong':
+                # answered with 400 like the real server does
+                raise ValueError('Invalid credentials')
+            return _dumps({'item': {'studentId': 1}})
+
+        if method == 'GET' and path == '/api/v1/profile':
+            return _dumps({'data': _expanded(fixtures.self_profile(1), query.get('expand'), SELF_PROFILE_EXPAND)})
+
+        if method == 'GET' and path == '/api/v2/community/profile/index':
+            return _profile(int(query['studentId']), query.get('expand'))
+
+        if method == 'GET' and path == '/api/v1/projects':
+            student_id = int(query['studentId']) if 'studentId' in query else None
+            return _projects(
+                student_id, int(query.get('page', 1)), int(query.get('perPage', 50)), fake.projects,
+                query.get('expand')
+            )
+
+        if method == 'GET' and path == '/api/v1/projects/trends':
+            return _projects(None, 1, 20, fake.projects, query.get('expand'))
+
+        if method == 'GET' and parts[:4] == ['api', 'v1', 'projects', 'info']:
+            return _project(int(parts[4]), query.get('expand'))
+
+        if parts[:4] == ['api', 'v1', 'projects', 'comment']:
+            id = int(parts[4])
+            if method == 'GET':
+                return _comments(id, int(query.get('page', 1)), int(query.get('perPage', 50)), fake.comments)
+            if method == 'POST':
+                data = fixtures.comment(id*1000, depth=0)
+                data['message'] = form['message']
+                return _dumps({'data': data})
+            if method == 'DELETE':
+                return _dumps({'data': {}})
+
+        if method == 'GET' and path == '/api/v1/python/open':
+            id = int(query['id'])
+            return _dumps({'data': {'content': fake.codes.get(id, f'print({id})')}})
+
+        if method == 'POST' and path == '/api/v1/python/save':
+            fake.codes[int(query['id'])] = form['content']
+            return _dumps({'data': {}})
+
+        if method == 'POST' and (
+            path in ('/api/v2/community/reaction/add', '/api/v2/community/reaction/remove')
+            or parts[:4] == ['api', 'v1', 'projects', 'update']
+        ):
+            return _dumps({'data': {}})
+
+        return None
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    server = FakeServer(
+        int(args[0]) if len(args) > 0 else 8000,
+        float(args[1]) if len(args) > 1 else 0.0,
+        error_rate=float(args[2]) if len(args) > 2 else 0.0
+    )
+    print(f'Serving on {server.url}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
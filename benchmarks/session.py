@@ -0,0 +1,108 @@
+'''
+End-to-end benchmark of `Session` against the local
+fake server: requests per second and latency of page
+requests, and the cost of building models from pages
+of different sizes.
+
+    python -m benchmarks.session [latency] [error rate]
+'''
+import sys
+import time
+import timeit
+from requests import RequestException
+from concurrent.futures import ThreadPoolExecutor
+
+from algo_api import Session, Metrics, ValidatorCache, Project, Profile, Comment, TRENDS_DAY, DefaultException
+from benchmarks import fixtures
+from benchmarks.server import FakeServer
+
+PAGE_SIZES = (10, 50, 100)
+
+
+def _failed(func) -> bool:
+    '''
+    Calls `func()` and returns `True` if it failed even
+    after retries, so that one error doesn't stop the run.
+    '''
+    try:
+        func()
+        return False
+    except (DefaultException, RequestException):
+        return True
+
+
+def models(number:int=20):
+    print('model construction, us per object')
+    print(f'  {"":<10}' + ''.join(f'{size:>10}' for size in PAGE_SIZES))
+    for cls, make in (
+        (Project, fixtures.project),
+        (Profile, fixtures.profile),
+        (Comment, fixtures.comment),
+    ):
+        row = []
+        for size in PAGE_SIZES:
+            items = [make(i) for i in range(1, size+1)]
+            seconds = timeit.timeit(lambda: [cls(i) for i in items], number=number)
+            row.append(seconds / number / size * 1e6)
+        print(f'  {cls.__name__:<10}' + ''.join(f'{i:10.1f}' for i in row))
+
+
+def throughput(server:FakeServer, requests:int=200, workers:int=8):
+    print(f'requests to {server.url}, latency {server.latency*1000:.0f} ms, '
+          f'error rate {server.error_rate:.0%}')
+    print(f'  {"":<24}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"failed":>10}')
+
+    for size in PAGE_SIZES:
+        # the server generates every page on the first request
+        session = Session('login', 'password', base_url=server.url, backoff=0)
+        for page in range(1, server.projects // size + 1):
+            _failed(lambda: session.get_projects(page=page, per_page=size))
+        session.close()
+
+        for threads in (1, workers):
+            metrics = Metrics()
+            session = Session('login', 'password', base_url=server.url, hooks=[metrics], backoff=0)
+            pages = [i % (server.projects // size) + 1 for i in range(requests)]
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                failed = sum(executor.map(
+                    lambda page: _failed(lambda: session.get_projects(page=page, per_page=size)), pages
+                ))
+            seconds = time.perf_counter() - start
+            session.close()
+
+            latency = metrics.to_dict()['requests']['GET /api/v1/projects']['latency']
+            name = f'{size} projects, {threads} thread{"s" if threads > 1 else ""}'
+            print(f'  {name:<24}{requests/seconds:10.0f}{latency["p50"]*1000:10.1f}'
+                  f'{latency["p99"]*1000:10.1f}{failed:10}')
+
+
+def polling(server:FakeServer, requests:int=200):
+    print('polling an unchanged trends page')
+    print(f'  {"":<24}{"req/s":>10}{"KiB":>10}{"304s":>10}{"failed":>10}')
+    for name, validators in (('full responses', None), ('conditional requests', ValidatorCache())):
+        metrics = Metrics()
+        session = Session(
+            'login', 'password', base_url=server.url, hooks=[metrics],
+            validators=validators, backoff=0
+        )
+        start = time.perf_counter()
+        failed = sum(_failed(lambda: session.get_trending(TRENDS_DAY)) for _ in range(requests))
+        seconds = time.perf_counter() - start
+        session.close()
+
+        stats = metrics.to_dict()['requests']['GET /api/v1/projects/trends']
+        print(f'  {name:<24}{requests/seconds:10.0f}{stats["received"]/1024:10.0f}'
+              f'{stats["statuses"].get(304, 0):10}{failed:10}')
+
+
+def main(latency:float=0.0, error_rate:float=0.0):
+    models()
+    with FakeServer(latency=latency, error_rate=error_rate) as server:
+        throughput(server)
+        polling(server)
+
+
+if __name__ == '__main__':
+    main(*map(float, sys.argv[1:]))
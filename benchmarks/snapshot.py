@@ -0,0 +1,48 @@
+'''
+Snapshot benchmark: writing a crawl of projects, opening
+it and reading random projects by ID.
+
+    python -m benchmarks.snapshot [projects]
+'''
+import os
+import random
+import sys
+import tempfile
+import time
+
+from algo_api.snapshot import SnapshotReader, SnapshotWriter
+from benchmarks.fixtures import projects_page
+
+
+def main(count:int=200_000, per_page:int=100, reads:int=10_000):
+    path = os.path.join(tempfile.mkdtemp(), 'projects.snap')
+
+    start = time.perf_counter()
+    with SnapshotWriter(path) as writer:
+        for page in range(1, count // per_page + 1):
+            writer.add_projects(projects_page(page, per_page))
+    seconds = time.perf_counter() - start
+    print(f'{count} projects, {os.path.getsize(path) / 2**20:.0f} MiB, written in {seconds:.2f} s')
+
+    start = time.perf_counter()
+    reader = SnapshotReader(path)
+    print(f'  open:                 {(time.perf_counter() - start) * 1000:8.2f} ms')
+
+    ids = random.Random(0).sample(range(1, count+1), reads)
+    start = time.perf_counter()
+    for i in ids:
+        reader.project(i)
+    seconds = time.perf_counter() - start
+    print(f'  random project(id):   {seconds / reads * 1e6:8.1f} us')
+    reader.close()
+
+    os.remove(path+'.idx')
+    start = time.perf_counter()
+    SnapshotReader(path).close()
+    print(f'  open without index:   {(time.perf_counter() - start) * 1000:8.2f} ms')
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,75 @@
+'''
+Benchmark for turning pages of projects into columns.
+
+Compares building `Project` objects and reading their
+attributes with `project_columns()`, which reads the
+raw payloads directly.
+
+    python -m benchmarks.table [projects]
+'''
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from algo_api.classes import Project
+from algo_api.table import project_columns, numpy, to_numpy
+from benchmarks.fixtures import projects_page
+
+
+def from_models(items:list) -> dict:
+    projects = [Project(i) for i in items]
+    return {
+        'id':             [i.id for i in projects],
+        'type':           [i.type for i in projects],
+        'author_id':      [i.author.id for i in projects],
+        'likes':          [i.likes for i in projects],
+        'views':          [i.views for i in projects],
+        'remixes':        [i.remixes for i in projects],
+        'comments':       [i.comments for i in projects],
+        'reaction_likes': [i.reactions.likes for i in projects],
+        'reaction_loves': [i.reactions.loves for i in projects],
+        'reaction_fires': [i.reactions.fires for i in projects],
+        'is_deleted':     [i.is_deleted for i in projects],
+        'created_at':     [int(i.created_at.timestamp()) for i in projects],
+        'updated_at':     [int(i.updated_at.timestamp()) for i in projects],
+    }
+
+
+def measure(func, items:list) -> tuple:
+    gc.collect()
+    start = time.perf_counter()
+    func(items)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(items)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, seconds
+
+
+def main(count:int=50_000, per_page:int=100):
+    # every run gets its own payloads, as Project changes them
+    pages = [
+        json.dumps({'data': {'items': projects_page(page, per_page)}})
+        for page in range(1, count // per_page + 1)
+    ]
+    load = lambda: [i for page in pages for i in json.loads(page)['data']['items']]
+    print(f'{count} projects')
+
+    cases = {
+        'Project objects':   from_models,
+        'project_columns()': project_columns,
+    }
+    if numpy is not None:
+        cases['project_columns() + to_numpy()'] = lambda items: to_numpy(project_columns(items))
+
+    for name, func in cases.items():
+        peak, seconds = measure(func, load())
+        print(f'  {name:<32} peak {peak / 2**20:7.1f} MiB  {seconds:6.2f} s')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
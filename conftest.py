@@ -0,0 +1,2 @@
+# makes `algo_api` and `benchmarks` importable when running
+# `pytest` from anywhere, without installing the package
@@ -6,6 +6,11 @@ setup(
     description='Algoritmika Student API',
     author='moontr3',
     packages=find_packages(),
+    python_requires='>=3.10',
     install_requires=['requests'],
+    extras_require={
+        'fast': ['orjson', 'brotli'],
+        'table': ['numpy', 'pandas', 'pyarrow'],
+    },
     zip_safe=False
 )
\ No newline at end of file
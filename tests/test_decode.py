@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from algo_api import decode
+from algo_api.decode import iter_items
+from benchmarks import fixtures
+
+# brackets, quotes and escapes inside strings, nested arrays
+# and multibyte characters that can be split between chunks
+TRICKY = [
+    {'id': 1, 'message': 'closing } and ] inside a string'},
+    {'id': 2, 'message': '"}, {"id": 3} looks like the next element'},
+    {'id': 3, 'message': 'escaped \\"} quote and backslash \\\\'},
+    {'id': 4, 'children': [{'id': 5, 'children': [[], [{}]]}], 'empty': {}},
+    {'id': 6, 'message': 'кириллица и эмодзи 🙂 ]}'},
+    [1, [2, [3]], {'a': ']'}],
+]
+
+
+def _body(items:list, key:str='items', indent=None) -> bytes:
+    return json.dumps(
+        {'status': 'ok', 'data': {key: items, 'total': len(items)}},
+        ensure_ascii=False, indent=indent
+    ).encode()
+
+
+def _chunks(body:bytes, size:int) -> list:
+    return [body[i:i+size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_every_chunk_size(indent):
+    body = _body(TRICKY, indent=indent)
+    for size in range(1, 64):
+        assert list(iter_items(_chunks(body, size))) == TRICKY
+
+
+def test_whole_body_in_one_chunk():
+    items = [fixtures.project(i) for i in range(1, 51)]
+    assert list(iter_items([_body(items)])) == items
+
+
+def test_real_payloads_in_small_chunks():
+    items = [fixtures.comment(i, depth=2) for i in range(1, 21)]
+    assert list(iter_items(_chunks(_body(items), 7))) == items
+
+
+def test_stdlib_backend(monkeypatch):
+    monkeypatch.setattr(decode, 'loads', json.loads)
+    assert list(iter_items(_chunks(_body(TRICKY), 5))) == TRICKY
+
+
+def test_empty_array():
+    assert list(iter_items(_chunks(_body([]), 3))) == []
+
+
+def test_missing_key():
+    assert list(iter_items([b'{"data": {"other": [1, 2]}}'])) == []
+
+
+def test_custom_key():
+    body = _body(TRICKY[:2], key='children')
+    assert list(iter_items(_chunks(body, 4), key=b'children')) == TRICKY[:2]
+
+
+def test_key_split_between_chunks():
+    body = _body(TRICKY)
+    split = body.index(b'"items"') + 3
+    assert list(iter_items([body[:split], body[split:]])) == TRICKY
+
+
+def test_scalars_are_rejected():
+    with pytest.raises(ValueError):
+        list(iter_items([b'{"items": [1, 2, 3]}']))
+
+
+def test_truncated_body():
+    body = _body(TRICKY)
+    items = iter_items([body[:len(body)//2]])
+    with pytest.raises(ValueError):
+        list(items)
@@ -0,0 +1,58 @@
+from algo_api import Session, Project, Comment, IdentityMap, SnapshotWriter, SnapshotReader
+from benchmarks import fixtures
+from benchmarks.server import FakeServer
+
+
+def _project(id:int, author_name:str) -> dict:
+    data = fixtures.project(id)
+    data['author'] = {**fixtures.author(1), 'name': author_name}
+    return data
+
+
+def test_authors_are_shared():
+    identity_map = IdentityMap()
+    first = Project(_project(1, 'a'), identity_map=identity_map)
+    second = Project(_project(2, 'a'), lazy=True, identity_map=identity_map)
+
+    assert first.author is second.author
+    assert identity_map.get(1) is first.author
+    assert Project(_project(3, 'a')).author is not first.author
+
+
+def test_changed_preview_is_replaced():
+    identity_map = IdentityMap()
+    old = Project(_project(1, 'old name'), identity_map=identity_map)
+    new = Project(_project(2, 'new name'), identity_map=identity_map)
+
+    # objects built before keep the preview they got
+    assert old.author.full_name == 'old name'
+    assert new.author.full_name == 'new name'
+    assert identity_map.get(1) is new.author
+
+
+def test_replies_use_the_map():
+    identity_map = IdentityMap()
+    comment = Comment(fixtures.comment(2, depth=2), identity_map=identity_map)
+    reply = comment.children[0]
+
+    assert identity_map.get(reply.author.id) is reply.author
+
+
+def test_session_option():
+    identity_map = IdentityMap()
+    with FakeServer() as server:
+        session = Session('login', 'password', base_url=server.url, identity_map=identity_map)
+        projects = session.get_projects(1, per_page=20)
+        plain = Session('login', 'password', base_url=server.url).get_projects(1, per_page=20)
+
+    assert all(identity_map.get(i.author.id) is i.author for i in projects)
+    assert all(identity_map.get(i.author.id) is not i.author for i in plain)
+
+
+def test_snapshot_option(tmp_path):
+    path = str(tmp_path / 'crawl.snap')
+    with SnapshotWriter(path) as writer:
+        writer.add_projects([_project(1, 'a'), _project(2, 'a')])
+
+    with SnapshotReader(path, identity_map=IdentityMap()) as reader:
+        assert reader.project(1).author is reader.project(2).author
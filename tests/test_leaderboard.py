@@ -0,0 +1,88 @@
+import pytest
+
+from algo_api import Leaderboard, Project, RANK_LIKES, RANK_VIEWS, REACTION_LIKE
+from benchmarks import fixtures
+
+
+def _project(id:int, likes:int, views:int=0, type:str='python') -> Project:
+    # reactions, comments and remixes are ranked like likes
+    data = fixtures.project(id)
+    data.update(
+        likesCount=likes, viewsCount=views, commentsCount=likes, remixesCount=likes, type=type,
+        reactions={'my': [], 'counters': {REACTION_LIKE: likes}}
+    )
+    return Project(data)
+
+
+def _ids(board:Leaderboard, *args, **kwargs) -> list:
+    return [i.id for i in board.top(*args, **kwargs)]
+
+
+def test_keeps_the_best_k():
+    board = Leaderboard(k=3)
+    board.update(_project(i, likes=i, views=i) for i in range(1, 11))
+
+    assert _ids(board, RANK_LIKES, 3) == [10, 9, 8]
+    assert _ids(board, RANK_LIKES, 2) == [10, 9]
+    # projects that dropped out of every top are forgotten
+    assert len(board) == 3
+
+
+def test_project_stays_while_in_any_top():
+    board = Leaderboard(k=2)
+    board.update([
+        _project(1, likes=100, views=0),
+        _project(2, likes=0, views=100),
+        _project(3, likes=50, views=50),
+        _project(4, likes=10, views=10),
+    ])
+    assert _ids(board, RANK_LIKES, 2) == [1, 3]
+    assert _ids(board, RANK_VIEWS, 2) == [2, 3]
+    # 4 isn't in any top, 1 and 2 are only in one each
+    assert len(board) == 3
+
+
+def test_updated_scores_reorder():
+    board = Leaderboard(k=2)
+    board.update([_project(1, likes=10), _project(2, likes=20)])
+    board.update([_project(1, likes=30)])
+
+    assert _ids(board, RANK_LIKES, 2) == [1, 2]
+    assert board.top(RANK_LIKES, 1)[0].likes == 30
+
+
+def test_evicted_project_can_come_back():
+    board = Leaderboard(k=1)
+    board.update([_project(1, likes=10, views=10)])
+    board.update([_project(2, likes=20, views=20)])
+    assert _ids(board, RANK_LIKES, 1) == [2]
+    assert len(board) == 1
+
+    board.update([_project(1, likes=30, views=30)])
+    assert _ids(board, RANK_LIKES, 1) == [1]
+    assert _ids(board, RANK_VIEWS, 1) == [1]
+    assert len(board) == 1
+
+
+def test_per_type():
+    board = Leaderboard(k=2)
+    board.update([
+        _project(1, likes=30, type='python'),
+        _project(2, likes=20, type='scratch'),
+        _project(3, likes=10, type='scratch'),
+    ])
+    assert _ids(board, RANK_LIKES, 2) == [1, 2]
+    assert _ids(board, RANK_LIKES, 2, type='scratch') == [2, 3]
+    assert _ids(board, RANK_LIKES, 2, type='video') == []
+
+
+def test_invalid_arguments():
+    board = Leaderboard(k=5)
+    with pytest.raises(ValueError):
+        board.top('unknown')
+    with pytest.raises(ValueError):
+        board.top(RANK_LIKES, 6)
+    with pytest.raises(ValueError):
+        Leaderboard(k=0)
+    with pytest.raises(TypeError):
+        Leaderboard(k='5')
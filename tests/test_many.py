@@ -0,0 +1,52 @@
+import pytest
+
+from algo_api import Session, Profile, UnknownException
+from benchmarks.server import FakeServer
+
+
+@pytest.fixture(scope='module')
+def server():
+    with FakeServer() as server:
+        yield server
+
+
+def _ids(count:int, taken:list):
+    for i in range(1, count+1):
+        taken.append(i)
+        yield i
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_every_id_is_yielded(server, ordered):
+    session = Session('login', 'password', base_url=server.url)
+    results = dict(session.get_profiles_many(range(1, 101), workers=4, ordered=ordered))
+
+    assert sorted(results) == list(range(1, 101))
+    assert all(isinstance(i, Profile) and i.id == id for id, i in results.items())
+
+
+def test_ordered(server):
+    session = Session('login', 'password', base_url=server.url)
+    ids = [id for id, _ in session.get_profiles_many(range(1, 101), workers=8)]
+    assert ids == list(range(1, 101))
+
+
+def test_errors_dont_stop_the_batch():
+    with FakeServer(error_rate=0.3) as server:
+        session = Session('login', 'password', base_url=server.url, retries=0)
+        results = dict(session.get_profiles_many(range(1, 101), workers=4))
+
+    errors = [i for i in results.values() if isinstance(i, UnknownException)]
+    assert len(results) == 100
+    assert 0 < len(errors) < 100
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_ids_are_taken_as_needed(server, ordered):
+    session = Session('login', 'password', base_url=server.url)
+    taken = []
+    results = session.get_profiles_many(_ids(300, taken), workers=4, ordered=ordered)
+    # no more than two calls per worker are submitted ahead
+    for yielded, _ in enumerate(results, 1):
+        assert len(taken) - yielded <= 8
+    assert len(taken) == 300
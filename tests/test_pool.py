@@ -0,0 +1,30 @@
+import threading
+import time
+
+from algo_api import SessionPool
+from benchmarks.server import FakeServer
+
+
+def test_logged_out_sessions_are_logged_back_in():
+    with FakeServer(latency=0.002) as server:
+        pool = SessionPool([('a', 'a'), ('b', 'b')], base_url=server.url)
+        errors = []
+        def load():
+            for i in range(1, 101):
+                try:
+                    assert pool.get_profile(i).id == i
+                except Exception as e:
+                    errors.append(e)
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for i in threads:
+            i.start()
+        # log everyone out while requests are in flight
+        while any(i.is_alive() for i in threads):
+            time.sleep(0.3)
+            server.expire()
+        for i in threads:
+            i.join()
+        pool.close()
+
+    assert errors == []
+    assert server.logins > 2
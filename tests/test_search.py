@@ -0,0 +1,54 @@
+import threading
+
+from algo_api import SearchIndex, RANK_LIKES, RANK_VIEWS
+from benchmarks import fixtures
+
+
+def _projects(count:int) -> list:
+    items = []
+    for i in range(1, count+1):
+        data = fixtures.project(i)
+        data.update(title=f'alpha {i}', description=None, likesCount=i, viewsCount=count-i)
+        items.append(data)
+    return items
+
+
+def test_ranks():
+    index = SearchIndex()
+    index.add_projects(_projects(100))
+
+    assert index.search_projects('alpha', limit=3) == [100, 99, 98]
+    assert index.search_projects('alpha', rank=RANK_VIEWS, limit=3) == [1, 2, 3]
+
+
+def test_readding_keeps_the_index_small():
+    index = SearchIndex()
+    items = _projects(100)
+    for _ in range(10):
+        index.add_projects(items)
+
+    assert len(index) == 100
+    assert index.search_projects('alpha', limit=3) == [100, 99, 98]
+
+
+def test_search_while_compacting():
+    index = SearchIndex()
+    items = _projects(2000)
+    index.add_projects(items)
+    expected = [2000, 1999, 1998, 1997, 1996]
+
+    stop = threading.Event()
+    def add():
+        # every second round replaces half of the index and compacts it
+        while not stop.is_set():
+            index.add_projects(items[:1000])
+            index.add_projects(items[1000:])
+    thread = threading.Thread(target=add)
+    thread.start()
+    try:
+        results = [index.search_projects('alpha', rank=RANK_LIKES, limit=5) for _ in range(300)]
+    finally:
+        stop.set()
+        thread.join()
+
+    assert all(i == expected for i in results)
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+
+from algo_api import SnapshotWriter, SnapshotReader, Project, Profile, Comment
+from benchmarks import fixtures
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'crawl.snap')
+
+
+def _write(path:str, projects=(), profiles=(), comments=()):
+    with SnapshotWriter(path) as writer:
+        writer.add_projects(projects)
+        for i in profiles:
+            writer.add_profile(i)
+        writer.add_comments(comments)
+
+
+def test_round_trip(path):
+    projects = [fixtures.project(i) for i in range(1, 101)]
+    profiles = [fixtures.profile(i) for i in range(1, 11)]
+    comments = [fixtures.comment(i, depth=0) for i in range(1, 21)]
+    _write(path, projects, profiles, comments)
+
+    with SnapshotReader(path) as reader:
+        assert len(reader) == 130
+        assert reader.project(42).dict == projects[41]
+        assert reader.profile(3).dict == profiles[2]
+        assert reader.comment(7).dict == comments[6]
+        assert [i.dict for i in reader.projects()] == projects
+        assert [i.id for i in reader.profiles()] == list(range(1, 11))
+        assert [i.id for i in reader.comments()] == list(range(1, 21))
+
+
+def test_objects_and_dicts(path):
+    _write(path, [Project(fixtures.project(1)), fixtures.project(2)])
+    with SnapshotReader(path) as reader:
+        assert isinstance(reader.project(1), Project)
+        assert reader.project(2).title == fixtures.project(2)['title']
+
+
+def test_objects_without_dict_are_rejected(path):
+    with SnapshotWriter(path) as writer:
+        with pytest.raises(ValueError):
+            writer.add_project(Project(fixtures.project(1), keep_dict=False))
+
+
+def test_missing_id(path):
+    _write(path, [fixtures.project(1)])
+    with SnapshotReader(path) as reader:
+        with pytest.raises(KeyError):
+            reader.project(2)
+        with pytest.raises(KeyError):
+            reader.profile(1)
+
+
+def test_latest_record_wins(path):
+    old = fixtures.project(1)
+    new = {**old, 'title': 'renamed'}
+    _write(path, [old])
+    _write(path, [new, fixtures.project(2)])
+
+    with SnapshotReader(path) as reader:
+        assert len(reader) == 2
+        assert reader.project(1).title == 'renamed'
+
+
+def test_reader_options(path):
+    _write(path, [fixtures.project(1)])
+    with SnapshotReader(path, keep_dict=False) as reader:
+        assert reader.project(1).dict is None
+    with pytest.raises(ValueError):
+        SnapshotReader(path, lazy=True, keep_dict=False)
+
+
+def test_not_a_snapshot(path):
+    with open(path, 'wb') as f:
+        f.write(b'something else entirely')
+    with pytest.raises(ValueError):
+        SnapshotReader(path)
+    with pytest.raises(ValueError):
+        SnapshotWriter(path)
+
+
+def test_missing_index_is_rebuilt(path):
+    _write(path, [fixtures.project(i) for i in range(1, 11)])
+    os.remove(path+'.idx')
+
+    with SnapshotReader(path) as reader:
+        assert len(reader) == 10
+        assert reader.project(5).id == 5
+
+
+def test_records_after_the_index_are_found(path):
+    # an index that doesn't cover later records, as if the
+    # process died after writing them but before flush()
+    _write(path, [fixtures.project(1)])
+    with open(path+'.idx', 'rb') as f:
+        index = f.read()
+    _write(path, [fixtures.project(2)])
+    with open(path+'.idx', 'wb') as f:
+        f.write(index)
+
+    with SnapshotReader(path) as reader:
+        assert [i.id for i in reader.projects()] == [1, 2]
+    with SnapshotWriter(path) as writer:
+        writer.add_project(fixtures.project(3))
+    with SnapshotReader(path) as reader:
+        assert [i.id for i in reader.projects()] == [1, 2, 3]
+
+
+def test_cut_off_record_is_dropped(path):
+    _write(path, [fixtures.project(i) for i in range(1, 4)])
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size-10)
+
+    with SnapshotReader(path) as reader:
+        assert [i.id for i in reader.projects()] == [1, 2]
+
+    # the writer cuts the broken record off and appends after it
+    _write(path, [fixtures.project(3)])
+    with SnapshotReader(path) as reader:
+        assert [i.dict for i in reader.projects()] == [fixtures.project(i) for i in range(1, 4)]
@@ -0,0 +1,20 @@
+from algo_api import Session
+from benchmarks.server import FakeServer
+
+
+def test_batch_with_names_takes_one_request_each():
+    with FakeServer() as server:
+        session = Session('login', 'password', base_url=server.url)
+        ids = [id for id, code in session.get_source_codes(range(1, 21)) if isinstance(code, str)]
+        codes = {id: f'print({id}*2)' for id in ids}
+
+        requests = server.requests
+        results = dict(session.change_source_codes(codes, names={id: f'project {id}' for id in ids}))
+        assert server.requests - requests == len(ids)
+
+        requests = server.requests
+        results.update(session.change_source_codes(codes))
+        assert server.requests - requests == 2*len(ids)
+
+    assert len(ids) > 0
+    assert all(results[id] is None for id in ids)
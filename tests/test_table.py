@@ -0,0 +1,57 @@
+import pytest
+
+from algo_api import project_columns, profile_columns, to_numpy, to_pandas, to_arrow
+from benchmarks import fixtures
+
+
+def _profiles() -> list:
+    never_updated = fixtures.profile(1)
+    never_updated['updatedAt'] = None
+    without_stats = fixtures.profile(2)
+    del without_stats['stats']
+    return [never_updated, without_stats, fixtures.profile(3)]
+
+
+def test_project_columns():
+    items = [fixtures.project(i) for i in range(1, 4)]
+    items[1]['updatedAt'] = None
+    columns = project_columns(items)
+
+    assert columns['id'] == [1, 2, 3]
+    assert columns['updated_at'][1] is None
+    assert None not in columns['created_at']
+
+
+def test_profile_columns_with_missing_values():
+    columns = profile_columns(_profiles())
+
+    assert columns['id'] == [1, 2, 3]
+    assert columns['updated_at'][0] is None
+    assert columns['classmates'][1] is None
+    assert columns['followers'][1] is None
+    assert None not in columns['classmates'][::2]
+
+
+def test_numpy_missing_values():
+    numpy = pytest.importorskip('numpy')
+    array = to_numpy(profile_columns(_profiles()))
+
+    assert numpy.isnat(array['updated_at'][0])
+    assert numpy.isnan(array['classmates'][1])
+    assert array['id'].dtype == numpy.int64
+
+
+def test_pandas_missing_values():
+    pytest.importorskip('pandas')
+    frame = to_pandas(profile_columns(_profiles()))
+
+    assert frame['updated_at'].isna().tolist() == [True, False, False]
+    assert frame['classmates'].isna().tolist() == [False, True, False]
+
+
+def test_arrow_missing_values():
+    pytest.importorskip('pyarrow')
+    table = to_arrow(profile_columns(_profiles()))
+
+    assert table['updated_at'].null_count == 1
+    assert table['classmates'].null_count == 1